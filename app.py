@@ -1,10 +1,12 @@
+import time
+
+_import_started = time.perf_counter()
+
 from flask_jwt_extended import JWTManager
 from flask import render_template
 import os
 from flask import Flask
 from flask_cors import CORS
-from models.seed_admin import seed_admin
-from models.seed_user import seed_user
 
 
 from routes.auth import auth_bp
@@ -12,96 +14,111 @@ from routes.system import system_bp
 from routes.dashboard import dashboard_bp
 from routes.users import users_bp
 from routes.requests import requests_bp
-from models.schema import init_db
-from models.db import ensure_request_columns
+from models import db as db_manager
+from models.cli import register_cli
+from utils.auth import init_jwt
 import routes.admin_settings
-from models.seed_kb_articles import seed_kb_articles
 
 
+# - - - - - - - - - - - -  -
+# Default config (override via create_app(config))
+# - - - - - - - - - - - -  -
+DEFAULT_CONFIG = {
+    # JWT config
+    "JWT_SECRET_KEY": "dev-secret-change-later",
+    "JWT_TOKEN_LOCATION": ["cookies"],
+    "JWT_ACCESS_COOKIE_NAME": "access_token",
+    "JWT_ACCESS_COOKIE_PATH": "/",
+    "JWT_COOKIE_SECURE": True,          # True in HTTPS prod
+    "JWT_COOKIE_SAMESITE": "Lax",
+    "JWT_COOKIE_CSRF_PROTECT": False,
+
+    # SQLite database file (None: app.db next to the code, models.db.DB_PATH)
+    "DATABASE": None,
 
+    # SQLite connection profile (merged over models.db.PRAGMA_PROFILE)
+    "SQLITE_PRAGMAS": {},
 
-app = Flask(__name__)
-CORS(app)
+    # Seconds an admin live-feed stream stays open before the client
+    # reconnects (None: routes.dashboard.admin.LIVE_MAX_SECONDS)
+    "ADMIN_LIVE_MAX_SECONDS": None,
+}
 
 
 # Context processor
-@app.context_processor
 def inject_user_prefs():
-    from flask_jwt_extended import get_jwt_identity
-    from models.db import get_db_connection
+    from utils.identity import load_identity
 
     try:
-        user_id = get_jwt_identity()
-        if not user_id:
+        identity = load_identity()
+        if not identity:
             return {}
 
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT * FROM user_preferences WHERE user_id = ?",
-            (int(user_id),)
-        )
-        prefs = cur.fetchone()
-        conn.close()
-
-        return {"prefs": prefs}
+        return {"prefs": identity["prefs"]}
     except Exception:
         return {}
 
 
-# JWT config
-app.config["JWT_SECRET_KEY"] = "dev-secret-change-later"
-app.config["JWT_TOKEN_LOCATION"] = ["cookies"]
-app.config["JWT_ACCESS_COOKIE_NAME"] = "access_token"
-app.config["JWT_ACCESS_COOKIE_PATH"] = "/"
+def create_app(config=None):
+    """
+    Application factory. Does no database work: run `flask db upgrade`
+    and `flask seed` (or `python app.py` in development) to prepare the DB.
+    """
+    started = time.perf_counter()
 
-app.config["JWT_COOKIE_SECURE"] = True          # True in HTTPS prod
-app.config["JWT_COOKIE_SAMESITE"] = "Lax"
-app.config["JWT_COOKIE_CSRF_PROTECT"] = False 
-  
+    app = Flask(__name__)
+    CORS(app)
 
+    app.config.update(DEFAULT_CONFIG)
+    if config:
+        app.config.update(config)
 
-jwt = JWTManager(app)
+    init_jwt(JWTManager(app))
+    db_manager.init_app(app)
+    register_cli(app)
 
-# - - - - - - - - - - - -  -
-# Initialize database
-# - - - - - - - - - - - -  -
-with app.app_context():
-    init_db()
-    ensure_request_columns()
-    seed_admin()
-    seed_user()
-    seed_kb_articles()
+    app.context_processor(inject_user_prefs)
 
+    # - - - - - - - - - - - -  -
+    # Register blueprints
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(system_bp)
+    app.register_blueprint(users_bp)
+    app.register_blueprint(dashboard_bp)
+    app.register_blueprint(requests_bp) #added 1/1 to fix the above line (duplicated)
 
+    # - - - - - - - - - - - -  -
+    # Page Routes
+    # - - - - - - - - - - - -  -
+    @app.get("/login")
+    def login_page():
+        return render_template("login.html")
 
-# - - - - - - - - - - - -  -
-# Register blueprints
-app.register_blueprint(auth_bp)
-app.register_blueprint(system_bp)
-app.register_blueprint(users_bp)
-app.register_blueprint(dashboard_bp)
-app.register_blueprint(requests_bp) #added 1/1 to fix the above line (duplicated)
+    # - - - - - - - - - - - -  -
+    # Global Error Handlder
+    # - - - - - - - - - - - -  -
+    @app.errorhandler(403)
+    def forbidden(e):
+        return render_template("403.html"), 403
 
-# - - - - - - - - - - - -  -
-# Page Routes 
-# - - - - - - - - - - - -  -
-@app.get("/login")
-def login_page():
-    return render_template("login.html")
+    # Worker cold start: module imports + factory (reported by /system/stats)
+    app.config["STARTUP_MS"] = round((time.perf_counter() - _import_started) * 1000, 1)
+    app.config["CREATE_APP_MS"] = round((time.perf_counter() - started) * 1000, 1)
 
+    return app
 
-# - - - - - - - - - - - -  -
-# Global Error Handlder 
-# - - - - - - - - - - - -  -
-@app.errorhandler(403)
-def forbidden(e):
-    return render_template("403.html"), 403
+
+# WSGI entry point (gunicorn app:app)
+app = create_app()
 
 
 # - - - - - - - - - - - -  -
-# Run / Main Guard 
+# Run / Main Guard
 # - - - - - - - - - - - -  -
 if __name__ == "__main__":
-    app.run(debug=True)
+    from models.cli import upgrade_and_seed
 
+    with app.app_context():
+        upgrade_and_seed()
+
+    app.run(debug=True)
@@ -0,0 +1,229 @@
+"""
+Date-range analytics over request_daily and request_latency (maintained
+by triggers, see migrations/0014_request_daily_rollups.py and
+0015_request_latency_sketches.py).
+
+Filters narrow the rollup rows, never requests: a report over any range
+reads at most one row per (day, category, department, priority, status)
+in that range, and latency percentiles merge one sketch per day.
+"""
+from datetime import datetime, timezone
+
+from rules.request_rules import VALID_CATEGORIES, VALID_STATUSES, VALID_PRIORITIES
+from models.request_filters import FilterError
+from models.quantiles import PERCENTILES, quantiles
+
+# Exact-match filters: form field -> allowed values (None: any)
+ANALYTICS_FILTERS = {
+    "category": VALID_CATEGORIES,
+    "department": None,
+    "priority": VALID_PRIORITIES,
+    "status": VALID_STATUSES,
+}
+
+_SUMS = """
+    SUM(count) AS total,
+    SUM(completed) AS completed,
+    SUM(completion_hours) AS completion_hours,
+    SUM(sla_met) AS sla_met,
+    SUM(sla_missed) AS sla_missed
+"""
+
+
+def _day(value, name):
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise FilterError(f"{name} must be YYYY-MM-DD")
+    return value
+
+
+def selected_ts_range(selected):
+    """
+    (since_ts, until_ts) epoch bounds for the selected date range; None
+    for an open end. until_ts is exclusive.
+    """
+    def day_start(value):
+        return int(datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+
+    since_ts = day_start(selected["date_from"]) if "date_from" in selected else None
+    until_ts = day_start(selected["date_to"]) + 86400 if "date_to" in selected else None
+    return since_ts, until_ts
+
+
+def filters_sql(selected, columns=tuple(ANALYTICS_FILTERS)):
+    """
+    (where, params) for already validated filters, limited to the
+    dimension columns the target table has.
+    """
+    where = []
+    params = []
+
+    if "date_from" in selected:
+        where.append("day >= ?")
+        params.append(selected["date_from"])
+    if "date_to" in selected:
+        where.append("day <= ?")
+        params.append(selected["date_to"])
+
+    for name in columns:
+        if name in selected:
+            where.append(f"{name} = ?")
+            params.append(selected[name])
+
+    return where, params
+
+
+def parse_analytics_filters(args):
+    """
+    Reads date_from, date_to (inclusive, YYYY-MM-DD) and the
+    ANALYTICS_FILTERS from args. Returns (where, params, selected) against
+    request_daily. 'all' or an empty value means no filter. Raises
+    FilterError.
+    """
+    selected = {}
+
+    for name in ("date_from", "date_to"):
+        value = (args.get(name) or "").strip()
+        if value:
+            selected[name] = _day(value, name)
+
+    if selected.get("date_from", "") > selected.get("date_to", "9999"):
+        raise FilterError("date_from is after date_to")
+
+    for name, allowed in ANALYTICS_FILTERS.items():
+        value = (args.get(name) or "").strip()
+        if not value or value == "all":
+            continue
+        if allowed is not None and value not in allowed:
+            raise FilterError(f"invalid {name}")
+        selected[name] = value
+
+    where, params = filters_sql(selected)
+    return where, params, selected
+
+
+def _summarize(row):
+    total = row["total"] or 0
+    completed = row["completed"] or 0
+    sla_met = row["sla_met"] or 0
+    sla_missed = row["sla_missed"] or 0
+    judged = sla_met + sla_missed
+    return {
+        "total": total,
+        "completed": completed,
+        "avg_completion_hours": (row["completion_hours"] / completed) if completed else None,
+        "sla_met": sla_met,
+        "sla_missed": sla_missed,
+        "sla_met_rate": (sla_met / judged * 100) if judged else None,
+    }
+
+
+def rollup_report(conn, where, params):
+    """
+    Aggregates the rollups matching (where, params) from
+    parse_analytics_filters. Returns a dict with:
+
+    totals        summary over everything matched
+    by_status     {status: count}
+    by_category   summaries per category, largest first
+    by_department summaries per department, largest first
+    daily         [(day, created, completed)] in day order
+    """
+    where_sql = (" WHERE " + " AND ".join(where)) if where else ""
+
+    totals = conn.execute(
+        f"SELECT {_SUMS} FROM request_daily{where_sql}", params
+    ).fetchone()
+
+    def grouped(column):
+        rows = conn.execute(
+            f"""
+            SELECT {column} AS key, {_SUMS}
+            FROM request_daily{where_sql}
+            GROUP BY {column}
+            HAVING SUM(count) > 0
+            ORDER BY total DESC, key
+            """,
+            params,
+        ).fetchall()
+        return [dict(_summarize(row), key=row["key"]) for row in rows]
+
+    daily = conn.execute(
+        f"""
+        SELECT day, SUM(count) AS total, SUM(completed) AS completed
+        FROM request_daily{where_sql}
+        GROUP BY day
+        HAVING SUM(count) > 0
+        ORDER BY day
+        """,
+        params,
+    ).fetchall()
+
+    return {
+        "totals": _summarize(totals),
+        "by_status": {s["key"]: s["total"] for s in grouped("status")},
+        "by_category": grouped("category"),
+        "by_department": grouped("department"),
+        "daily": [(row["day"], row["total"], row["completed"]) for row in daily],
+    }
+
+
+# Dimensions request_latency is kept by (it has no status: a latency
+# belongs to the transition, not to where the request is now)
+LATENCY_DIMENSIONS = ("category", "department", "priority")
+
+
+def _percentiles(counts):
+    estimates = quantiles(counts)
+    if estimates is None:
+        return None
+    return {
+        "count": sum(counts.values()),
+        **{f"p{round(q * 100)}": estimates[q] / 3600 for q in PERCENTILES},
+    }
+
+
+def latency_report(conn, selected, metric):
+    """
+    p50/p90/p99 hours for `metric` ('approval' or 'completion') over the
+    days and dimensions in `selected` (from parse_analytics_filters),
+    bucketed by the day the transition happened.
+
+    Returns {"overall": stats, "category": [...], "department": [...],
+    "priority": [...]}, where stats is {"count", "p50", "p90", "p99"} or
+    None when nothing matched, and each list holds stats dicts with a
+    "key" for every non-empty group.
+    """
+    where, params = filters_sql(selected, LATENCY_DIMENSIONS)
+    where_sql = "".join(f" AND {w}" for w in where)
+
+    rows = conn.execute(
+        f"""
+        SELECT category, department, priority, bucket, SUM(count) AS n
+        FROM request_latency
+        WHERE metric = ?{where_sql}
+        GROUP BY category, department, priority, bucket
+        """,
+        (metric, *params),
+    ).fetchall()
+
+    # Merge the per-day sketches, then each dimension's groups
+    overall = {}
+    groups = {dimension: {} for dimension in LATENCY_DIMENSIONS}
+    for row in rows:
+        bucket, n = row["bucket"], row["n"]
+        overall[bucket] = overall.get(bucket, 0) + n
+        for dimension in LATENCY_DIMENSIONS:
+            counts = groups[dimension].setdefault(row[dimension], {})
+            counts[bucket] = counts.get(bucket, 0) + n
+
+    report = {"overall": _percentiles(overall)}
+    for dimension, by_key in groups.items():
+        stats = [
+            dict(_percentiles(counts), key=key)
+            for key, counts in by_key.items()
+            if sum(counts.values()) > 0
+        ]
+        report[dimension] = sorted(stats, key=lambda s: (-s["count"], s["key"]))
+    return report
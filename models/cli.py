@@ -0,0 +1,91 @@
+"""
+Flask CLI commands for schema and seed data.
+
+    flask --app app db upgrade [--target N]
+    flask --app app db status
+    flask --app app seed
+    flask --app app import-requests dump.jsonl
+"""
+import click
+from flask.cli import AppGroup
+
+from models import migrations
+from models.seed_admin import seed_admin
+from models.seed_user import seed_user
+from models.seed_kb_articles import seed_kb_articles
+from models.request_import import import_requests, BATCH_SIZE
+
+db_cli = AppGroup("db", help="Database schema migrations.")
+
+
+@db_cli.command("upgrade")
+@click.option("--target", type=int, default=None, help="Stop after this migration version.")
+def upgrade_command(target):
+    """Apply pending migrations."""
+    applied = migrations.upgrade(target=target)
+    for name in applied:
+        click.echo(f"✅ Applied {name}")
+    if not applied:
+        click.echo("ℹ️ Database already up to date")
+    click.echo(f"user_version = {migrations.current_version()}")
+
+
+@db_cli.command("status")
+def status_command():
+    """List migrations and whether they are applied."""
+    click.echo(f"user_version = {migrations.current_version()}")
+    for version, name, applied in migrations.status():
+        click.echo(f"  [{'x' if applied else ' '}] {name}")
+
+
+@click.command("seed")
+def seed_command():
+    """Create the default admin/user accounts and KB articles."""
+    seed_all()
+
+
+@click.command("import-requests")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--batch-size", type=int, default=BATCH_SIZE, show_default=True, help="Rows per transaction.")
+@click.option("--keep-indexes", is_flag=True, help="Don't drop request indexes during the load.")
+@click.option("--restart", is_flag=True, help="Ignore the saved checkpoint and start from line 1.")
+def import_requests_command(path, batch_size, keep_indexes, restart):
+    """Bulk-load historical requests from a JSONL file."""
+
+    def progress(stats):
+        click.echo(
+            f"  line {stats['lines']:,}: {stats['imported']:,} imported, "
+            f"{stats['rejected']:,} rejected, {stats['rows_per_sec']:,.0f} rows/s"
+        )
+
+    stats = import_requests(
+        path,
+        batch_size=batch_size,
+        defer_indexes=not keep_indexes,
+        restart=restart,
+        progress=progress,
+    )
+
+    for line_no, message in stats["errors"]:
+        click.echo(f"⚠️ line {line_no}: {message}")
+    click.echo(
+        f"✅ Imported {stats['imported']:,} requests ({stats['rejected']:,} rejected) "
+        f"in {stats['seconds']:.1f}s, {stats['rows_per_sec']:,.0f} rows/s"
+    )
+
+
+def seed_all():
+    seed_admin()
+    seed_user()
+    seed_kb_articles()
+
+
+def upgrade_and_seed():
+    migrations.upgrade()
+    seed_all()
+
+
+def register_cli(app):
+    app.cli.add_command(db_cli)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(import_requests_command)
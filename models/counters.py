@@ -0,0 +1,40 @@
+"""
+Read helpers for request_counters (maintained by triggers, see
+migrations/0004_request_counters.py, 0020 and 0021).
+"""
+
+
+def read_counters(conn, *scopes):
+    """
+    Returns {scope: {key: (count, total)}} for the given scopes.
+    """
+    placeholders = ", ".join("?" for _ in scopes)
+    rows = conn.execute(
+        f"""
+        SELECT scope, key, count, total
+        FROM request_counters
+        WHERE scope IN ({placeholders})
+        """,
+        scopes,
+    ).fetchall()
+
+    counters = {scope: {} for scope in scopes}
+    for row in rows:
+        counters[row["scope"]][row["key"]] = (row["count"], row["total"])
+    return counters
+
+
+def read_counter(conn, scope, key):
+    """
+    Returns (count, total) for one counter row, for scopes that gain a
+    key per day and so should not be read whole.
+    """
+    row = conn.execute(
+        "SELECT count, total FROM request_counters WHERE scope = ? AND key = ?",
+        (scope, key),
+    ).fetchone()
+    return (row["count"], row["total"]) if row else (0, 0)
+
+
+def count(counters, scope, key):
+    return counters.get(scope, {}).get(key, (0, 0))[0]
@@ -1,52 +1,138 @@
 import sqlite3
 import os
+import threading
+
+from flask import current_app, g, has_app_context
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, "..", "app.db")
 
-def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
+
+# - - - - - - - - - - - - - -
+# Connection profile
+# - - - - - - - - - - - - - -
+# Applied to every new connection. Override per app with
+# app.config["SQLITE_PRAGMAS"] (see init_app).
+PRAGMA_PROFILE = {
+    "journal_mode": "WAL",      # readers don't block the writer
+    "synchronous": "NORMAL",    # safe with WAL, far fewer fsyncs
+    "busy_timeout": 5000,       # ms to wait on a lock before SQLITE_BUSY
+    "cache_size": -20000,       # negative = KiB, ~20 MB page cache
+    "mmap_size": 134217728,     # 128 MB memory-mapped reads
+    "temp_store": "MEMORY",
+}
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Optional sqlite3 trace callback for new connections (see models.query_audit)
+QUERY_TRACE = None
+
+_local = threading.local()
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    sqlite3 connection that stays open when callers close() it.
+
+    close() throws away uncommitted work (same as a real close) but
+    keeps the handle so the next caller on this thread can reuse it.
+    """
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def close_for_real(self):
+        super().close()
+
+
+def _open_connection(path, pragmas):
+    conn = sqlite3.connect(
+        path,
+        factory=PooledConnection,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
     conn.row_factory = sqlite3.Row
-    print(f"USING DB: {DB_PATH}")
+
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+    if QUERY_TRACE is not None:
+        conn.set_trace_callback(QUERY_TRACE)
+
     return conn
 
 
-def ensure_request_columns():
+def _settings():
     """
-    Ensures required columns exist on the requests table.
-    Safe to run multiple times.
+    (path, pragmas) of the current app (see init_app), or the module
+    defaults outside an app context.
     """
-    conn = get_db_connection()
-    cur = conn.cursor()
+    if has_app_context():
+        settings = current_app.extensions.get("sqlite")
+        if settings is not None:
+            return settings
+    return DB_PATH, PRAGMA_PROFILE
+
+
+def _thread_connection():
+    settings = _settings()
+    conn = getattr(_local, "conn", None)
 
-    # Get existing columns
-    cur.execute("PRAGMA table_info(requests)")
-    existing_columns = [row["name"] for row in cur.fetchall()]
+    # A handle inherited across fork (gunicorn --preload) must not be shared
+    if conn is not None and _local.pid != os.getpid():
+        conn = None
 
-    # Add priority column if missing
-    if "priority" not in existing_columns:
-        cur.execute("""
-            ALTER TABLE requests
-            ADD COLUMN priority TEXT DEFAULT 'medium'
-        """)
-        print("Added priority column")
+    # Opened for another app (database or pragmas) on this thread: reopen.
+    # The old handle closes once nothing references it.
+    if conn is not None and _local.settings != settings:
+        conn = None
 
-    # Add department column if missing
-    if "department" not in existing_columns:
-        cur.execute("""
-            ALTER TABLE requests
-            ADD COLUMN department TEXT NOT NULL DEFAULT 'corporate'
-        """)
-        print("Added department column")
+    if conn is None:
+        conn = _open_connection(*settings)
+        _local.conn = conn
+        _local.pid = os.getpid()
+        _local.settings = settings
+
+    return conn
+
+
+def get_db_connection():
+    """
+    Returns this request's connection (memoized on flask.g), or the
+    current thread's pooled connection outside an app context.
+    """
+    if has_app_context():
+        conn = g.get("_db_conn")
+        if conn is None:
+            conn = g._db_conn = _thread_connection()
+        return conn
+
+    return _thread_connection()
+
+
+def release_db_connection(exc=None):
+    conn = g.pop("_db_conn", None)
+    if conn is not None:
+        conn.close()
+
+
+def close_db_connection():
+    """
+    Actually closes the current thread's pooled connection.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close_for_real()
+        _local.conn = None
 
-    # Add admin review notes column if missing
-    if "admin_review_notes" not in existing_columns:
-        cur.execute("""
-            ALTER TABLE requests
-            ADD COLUMN admin_review_notes TEXT
-        """)
-        print("Added admin_review_notes column")
 
+def init_app(app):
+    # Per app, so two apps in one process never share a database
+    app.extensions["sqlite"] = (
+        app.config.get("DATABASE") or DB_PATH,
+        {**PRAGMA_PROFILE, **app.config.get("SQLITE_PRAGMAS", {})},
+    )
+    app.teardown_appcontext(release_db_connection)
 
-    conn.commit()
-    conn.close()
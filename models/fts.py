@@ -0,0 +1,23 @@
+"""
+Helpers shared by the FTS5 indexes (kb_articles_fts, requests_fts).
+"""
+import re
+
+_SEARCH_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_query(text):
+    """
+    FTS5 MATCH expression for free text: every word must match, each
+    quoted so user input can't inject FTS syntax. While the last word is
+    still being typed (no trailing space) it matches as a prefix. None if
+    the text has no words.
+    """
+    text = text or ""
+    words = _SEARCH_TOKEN.findall(text)
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words]
+    if not text[-1].isspace():
+        terms[-1] += "*"
+    return " ".join(terms)
@@ -0,0 +1,217 @@
+"""
+Knowledge-base article rendering and lookup.
+
+Markdown is rendered once per content version and stored in
+kb_articles.content_html, keyed by content_hash. Views read the stored
+HTML, through a small in-process LRU for the hottest articles, and never
+run markdown themselves unless a row has no HTML yet (new or edited).
+
+Search goes through the kb_articles_fts FTS5 index (migration 0012).
+"""
+import hashlib
+import html as html_lib
+
+from models.fts import fts_query
+from utils.cache import LRUCache
+
+MARKDOWN_EXTENSIONS = ["fenced_code", "tables"]
+
+# Rendered articles kept in memory per worker
+HTML_CACHE_SIZE = 128
+
+
+# content_hash -> rendered HTML
+_html_cache = LRUCache(HTML_CACHE_SIZE)
+
+
+def content_hash(content):
+    return hashlib.sha256(content.encode()).hexdigest()[:32]
+
+
+def render_markdown(content):
+    # Imported here: markdown is only needed when content changes
+    import markdown
+
+    return markdown.markdown(content, extensions=MARKDOWN_EXTENSIONS)
+
+
+def store_rendered(conn, article_id, content):
+    """
+    Renders content and stores it on the article. Returns (hash, html).
+    The caller commits.
+    """
+    digest = content_hash(content)
+    html = render_markdown(content)
+    conn.execute(
+        "UPDATE kb_articles SET content_html = ?, content_hash = ? WHERE id = ?",
+        (html, digest, article_id)
+    )
+    return digest, html
+
+
+def get_article(conn, slug):
+    """
+    Article metadata plus content_hash, without the (large) content
+    columns. Renders and stores the HTML first if the row has none.
+    Returns None for an unknown slug.
+    """
+    article = conn.execute(
+        """
+        SELECT id, title, slug, category, summary, created_at, content_hash
+        FROM kb_articles
+        WHERE slug = ?
+        """,
+        (slug,)
+    ).fetchone()
+
+    if article is None:
+        return None
+    article = dict(article)
+
+    if article["content_hash"] is None:
+        content = conn.execute(
+            "SELECT content FROM kb_articles WHERE id = ?",
+            (article["id"],)
+        ).fetchone()["content"]
+        article["content_hash"], html = store_rendered(conn, article["id"], content)
+        conn.commit()
+        _html_cache.put(article["content_hash"], html)
+
+    return article
+
+
+def article_html(conn, article):
+    """
+    Rendered HTML for an article from get_article.
+    """
+    digest = article["content_hash"]
+    html = _html_cache.get(digest)
+    if html is None:
+        row = conn.execute(
+            "SELECT content_html FROM kb_articles WHERE id = ? AND content_hash = ?",
+            (article["id"], digest)
+        ).fetchone()
+        if row is None or row["content_html"] is None:
+            # Edited between the two reads: render what is there now
+            content = conn.execute(
+                "SELECT content FROM kb_articles WHERE id = ?",
+                (article["id"],)
+            ).fetchone()["content"]
+            return render_markdown(content)
+        html = row["content_html"]
+        _html_cache.put(digest, html)
+    return html
+
+
+# - - - - - - - - - - - - - -
+# Full-text search (kb_articles_fts)
+# - - - - - - - - - - - - - -
+# bm25 column weights: title, summary, content, category
+BM25_WEIGHTS = (10.0, 4.0, 1.0, 2.0)
+
+# Snippet match markers; swapped for <mark> after HTML-escaping
+_MARK_OPEN, _MARK_CLOSE = "\x01", "\x02"
+
+
+def _snippet_html(snippet):
+    return (
+        html_lib.escape(snippet)
+        .replace(_MARK_OPEN, "<mark>")
+        .replace(_MARK_CLOSE, "</mark>")
+    )
+
+
+def kb_categories(conn):
+    """
+    Categories of the published articles, as stored.
+    """
+    rows = conn.execute(
+        "SELECT DISTINCT category FROM kb_articles WHERE is_published = 1"
+    ).fetchall()
+    return {row["category"] for row in rows}
+
+
+def search_articles(conn, text, category=None, limit=20):
+    """
+    Published articles matching text, best BM25 first.
+    Returns (results, facets): results are dicts with slug, title,
+    category, summary, snippet_html and score; facets maps each article
+    category with matches to its count, ignoring the category filter.
+
+    Ranking runs on the FTS index alone; only the top `limit` rows are
+    then joined to kb_articles and get snippets.
+    """
+    query = fts_query(text)
+    if query is None:
+        return [], {}
+
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+
+    # Unpublished articles are rare: exclude them by id inside the index scan
+    unpublished = "kb_articles_fts.rowid NOT IN (SELECT id FROM kb_articles WHERE is_published = 0)"
+
+    # Exact stored category, not an FTS token match on the category column
+    in_category, params = "", [query]
+    if category:
+        in_category = "AND kb_articles_fts.rowid IN (SELECT id FROM kb_articles WHERE category = ?)"
+        params.append(category)
+
+    # One pass over the matches, grouped by the stored category
+    facets = {
+        row["category"]: row["n"]
+        for row in conn.execute(
+            f"""
+            SELECT a.category, COUNT(*) AS n
+            FROM kb_articles_fts
+            JOIN kb_articles a ON a.id = kb_articles_fts.rowid
+            WHERE kb_articles_fts MATCH ? AND {unpublished}
+            GROUP BY a.category
+            """,
+            (query,)
+        )
+    }
+
+    top = conn.execute(
+        f"""
+        SELECT rowid AS id, bm25(kb_articles_fts, {weights}) AS score
+        FROM kb_articles_fts
+        WHERE kb_articles_fts MATCH ?
+          AND {unpublished}
+          {in_category}
+        ORDER BY score
+        LIMIT ?
+        """,
+        (*params, limit)
+    ).fetchall()
+    if not top:
+        return [], facets
+
+    scores = {row["id"]: row["score"] for row in top}
+    placeholders = ", ".join("?" for _ in scores)
+    rows = conn.execute(
+        f"""
+        SELECT
+            a.id,
+            a.slug,
+            a.title,
+            a.category,
+            a.summary,
+            snippet(kb_articles_fts, -1, ?, ?, '…', 16) AS snippet
+        FROM kb_articles_fts
+        JOIN kb_articles a ON a.id = kb_articles_fts.rowid
+        WHERE kb_articles_fts MATCH ?
+          AND kb_articles_fts.rowid IN ({placeholders})
+        """,
+        (_MARK_OPEN, _MARK_CLOSE, query, *scores)
+    ).fetchall()
+    rows = sorted(rows, key=lambda row: scores[row["id"]])
+
+    results = []
+    for row in rows:
+        result = dict(row)
+        del result["id"]
+        result["score"] = scores[row["id"]]
+        result["snippet_html"] = _snippet_html(result.pop("snippet"))
+        results.append(result)
+
+    return results, facets
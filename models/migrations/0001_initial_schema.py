@@ -0,0 +1,125 @@
+"""
+Baseline schema: users, requests, kb_articles, user_preferences,
+user_integrations.
+
+Databases created before versioning have these tables but may be missing
+columns that used to be added on every startup, so those are checked here
+once instead.
+"""
+
+
+def _add_missing_columns(conn, table, columns):
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for name, ddl in columns:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+
+
+def upgrade(conn):
+    # users table
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            role TEXT NOT NULL DEFAULT 'user',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            full_name TEXT,
+            department TEXT,
+            avatar_url TEXT
+        )
+    """)
+
+    _add_missing_columns(conn, "users", [
+        ("full_name", "TEXT"),
+        ("department", "TEXT"),
+        ("avatar_url", "TEXT"),
+    ])
+
+    # requests table
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            request_type TEXT NOT NULL,
+            category TEXT NOT NULL,
+            priority TEXT NOT NULL DEFAULT 'medium',
+            department TEXT NOT NULL DEFAULT 'corporate',
+            status TEXT NOT NULL DEFAULT 'pending',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            reviewed_at TIMESTAMP,
+            reviewed_by INTEGER,
+            admin_review_notes TEXT,
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            FOREIGN KEY (reviewed_by) REFERENCES users(id) ON DELETE SET NULL
+        )
+    """)
+
+    _add_missing_columns(conn, "requests", [
+        ("priority", "TEXT DEFAULT 'medium'"),
+        ("department", "TEXT NOT NULL DEFAULT 'corporate'"),
+        ("admin_review_notes", "TEXT"),
+    ])
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS kb_articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            slug TEXT NOT NULL UNIQUE,
+            category TEXT NOT NULL,
+            summary TEXT NOT NULL,
+            content TEXT NOT NULL,
+            is_published INTEGER NOT NULL DEFAULT 1,
+            created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS user_preferences (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL UNIQUE,
+
+            -- Notifications
+            email_on_approval BOOLEAN DEFAULT 1,
+            email_on_denial BOOLEAN DEFAULT 1,
+            email_on_status_change BOOLEAN DEFAULT 1,
+            email_on_comment BOOLEAN DEFAULT 1,
+            daily_digest BOOLEAN DEFAULT 0,
+
+            -- Display
+            theme TEXT DEFAULT 'light',
+            requests_per_page INTEGER DEFAULT 25,
+            default_view TEXT DEFAULT 'list',
+
+            -- Defaults
+            default_department TEXT,
+            default_priority TEXT DEFAULT 'medium',
+
+            -- Communication
+            timezone TEXT DEFAULT 'America/New_York',
+
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS user_integrations (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL UNIQUE,
+
+            -- Access / capability flags
+            csv_export_enabled BOOLEAN DEFAULT 1,
+            cloud_export_visible BOOLEAN DEFAULT 1,
+
+            can_export BOOLEAN DEFAULT 1,
+            can_view_integration_status BOOLEAN DEFAULT 1,
+
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+    """)
@@ -0,0 +1,22 @@
+"""
+Secondary indexes for the hot filters on requests.
+
+- status + created_at: admin queue, action-required counts, status filters
+- user_id + created_at: "my requests" lists and per-user stats
+- category + status: per-category breakdowns and filters
+- reviewed_by: reviewer joins (and ON DELETE SET NULL from users)
+- created_at: newest-first listings and date ranges with no other filter
+"""
+
+INDEXES = {
+    "idx_requests_status_created": "requests(status, created_at)",
+    "idx_requests_user_created": "requests(user_id, created_at)",
+    "idx_requests_category_status": "requests(category, status)",
+    "idx_requests_reviewed_by": "requests(reviewed_by)",
+    "idx_requests_created": "requests(created_at)",
+}
+
+
+def upgrade(conn):
+    for name, target in INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
@@ -0,0 +1,51 @@
+"""
+Integer epoch copies of requests.created_at / reviewed_at.
+
+created_ts and reviewed_ts (seconds since epoch, UTC) let date predicates
+be plain range comparisons on an index instead of DATE()/julianday() calls
+on the TEXT columns. Triggers keep them in sync for every writer; existing
+rows are backfilled in id-range batches.
+"""
+
+BATCH_SIZE = 5000
+
+
+def upgrade(conn):
+    conn.execute("ALTER TABLE requests ADD COLUMN created_ts INTEGER")
+    conn.execute("ALTER TABLE requests ADD COLUMN reviewed_ts INTEGER")
+
+    max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM requests").fetchone()[0]
+    for start in range(0, max_id, BATCH_SIZE):
+        conn.execute(
+            """
+            UPDATE requests
+            SET created_ts = CAST(strftime('%s', created_at) AS INTEGER),
+                reviewed_ts = CAST(strftime('%s', reviewed_at) AS INTEGER)
+            WHERE id > ? AND id <= ?
+            """,
+            (start, start + BATCH_SIZE),
+        )
+
+    # Writers that pass created_ts themselves (bulk imports) skip the trigger
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_created_ts
+        AFTER INSERT ON requests
+        WHEN NEW.created_ts IS NULL AND NEW.created_at IS NOT NULL
+        BEGIN
+            UPDATE requests
+            SET created_ts = CAST(strftime('%s', NEW.created_at) AS INTEGER)
+            WHERE id = NEW.id;
+        END
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_reviewed_ts
+        AFTER UPDATE OF reviewed_at ON requests
+        BEGIN
+            UPDATE requests
+            SET reviewed_ts = CAST(strftime('%s', NEW.reviewed_at) AS INTEGER)
+            WHERE id = NEW.id;
+        END
+    """)
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_requests_created_ts ON requests(created_ts)")
@@ -0,0 +1,91 @@
+"""
+request_counters: dashboard aggregates kept current by triggers.
+
+One row per (scope, key):
+- status           key = status                 count
+- category_status  key = 'category:status'      count
+- active_category  key = category               count, total = SUM(created_ts) of pending/in_progress
+- day              key = 'YYYY-MM-DD' (UTC)     count of requests created that day
+- completion       key = 'all'                  count, total = SUM(completion hours)
+
+Every trigger removes the OLD row's contribution and adds the NEW one's,
+so the table stays exact under any INSERT/UPDATE/DELETE on requests.
+"""
+
+# (scope, key expression, total expression, condition); R = NEW or OLD
+COUNTER_SCOPES = [
+    ("status", "R.status", "0", "1"),
+    ("category_status", "R.category || ':' || R.status", "0", "1"),
+    ("active_category", "R.category", "R.created_ts",
+     "R.status IN ('pending', 'in_progress') AND R.created_ts IS NOT NULL"),
+    ("day", "date(R.created_at)", "0", "R.created_at IS NOT NULL"),
+    ("completion", "'all'", "(R.reviewed_ts - R.created_ts) / 3600.0",
+     "R.status = 'completed' AND R.reviewed_ts IS NOT NULL AND R.created_ts IS NOT NULL"),
+]
+
+# Columns the counters depend on; other updates (notes, reviewer) skip the trigger
+COUNTED_COLUMNS = "status, category, created_at, created_ts, reviewed_ts"
+
+
+def _apply(row, sign):
+    statements = []
+    for scope, key, total, condition in COUNTER_SCOPES:
+        key, total, condition = (
+            expr.replace("R.", f"{row}.") for expr in (key, total, condition)
+        )
+        statements.append(f"""
+            INSERT INTO request_counters (scope, key, count, total)
+            SELECT '{scope}', {key}, {sign}, {sign} * ({total})
+            WHERE {condition}
+            ON CONFLICT (scope, key) DO UPDATE
+            SET count = count + excluded.count,
+                total = total + excluded.total;""")
+    return "".join(statements)
+
+
+def upgrade(conn):
+    # NUMERIC keeps SUM(created_ts) an exact integer; completion hours are REAL
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS request_counters (
+            scope TEXT NOT NULL,
+            key TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            total NUMERIC NOT NULL DEFAULT 0,
+            PRIMARY KEY (scope, key)
+        ) WITHOUT ROWID
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_counters_insert
+        AFTER INSERT ON requests
+        BEGIN{_apply("NEW", 1)}
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_counters_delete
+        AFTER DELETE ON requests
+        BEGIN{_apply("OLD", -1)}
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_counters_update
+        AFTER UPDATE OF {COUNTED_COLUMNS} ON requests
+        BEGIN{_apply("OLD", -1)}{_apply("NEW", 1)}
+        END
+    """)
+
+    # Backfill from existing rows
+    conn.execute("DELETE FROM request_counters")
+    for scope, key, total, condition in COUNTER_SCOPES:
+        key, total, condition = (
+            expr.replace("R.", "") for expr in (key, total, condition)
+        )
+        conn.execute(f"""
+            INSERT INTO request_counters (scope, key, count, total)
+            SELECT '{scope}', {key}, COUNT(*), COALESCE(SUM({total}), 0)
+            FROM requests
+            WHERE {condition}
+            GROUP BY {key}
+        """)
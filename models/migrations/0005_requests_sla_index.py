@@ -0,0 +1,12 @@
+"""
+Index for SLA classification: every SLA rule is a created_ts threshold
+per priority over active statuses, so (status, priority, created_ts)
+turns SLA counts and filters into covering index ranges.
+"""
+
+
+def upgrade(conn):
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_requests_sla
+        ON requests(status, priority, created_ts)
+    """)
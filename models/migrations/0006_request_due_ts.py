@@ -0,0 +1,59 @@
+"""
+Stored SLA deadline: requests.due_ts = created_ts + the priority's
+resolution target (epoch seconds).
+
+create_request sets it directly; these triggers cover other writers and
+priority changes. The targets are a copy of rules.sla_rules.SLA_RULES as
+it was when this migration was written, so changing SLA_RULES needs a new
+migration that recomputes due_ts and recreates the triggers.
+
+Indexed with status so overdue / due-soon queries are range scans.
+"""
+
+BATCH_SIZE = 5000
+
+# priority -> resolution target in hours (SLA_RULES at the time)
+RESOLUTION_HOURS = {
+    "low": 120,
+    "medium": 72,
+    "high": 48,
+}
+
+
+def _due_sql(row):
+    branches = " ".join(
+        f"WHEN '{priority}' THEN {hours * 3600}"
+        for priority, hours in RESOLUTION_HOURS.items()
+    )
+    created = f"COALESCE({row}created_ts, CAST(strftime('%s', {row}created_at) AS INTEGER))"
+    return f"{created} + CASE {row}priority {branches} END"
+
+
+def upgrade(conn):
+    conn.execute("ALTER TABLE requests ADD COLUMN due_ts INTEGER")
+
+    max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM requests").fetchone()[0]
+    for start in range(0, max_id, BATCH_SIZE):
+        conn.execute(
+            f"UPDATE requests SET due_ts = {_due_sql('')} WHERE id > ? AND id <= ?",
+            (start, start + BATCH_SIZE),
+        )
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_due_ts_insert
+        AFTER INSERT ON requests
+        WHEN NEW.due_ts IS NULL
+        BEGIN
+            UPDATE requests SET due_ts = {_due_sql('NEW.')} WHERE id = NEW.id;
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_due_ts_update
+        AFTER UPDATE OF priority, created_ts ON requests
+        BEGIN
+            UPDATE requests SET due_ts = {_due_sql('NEW.')} WHERE id = NEW.id;
+        END
+    """)
+
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_requests_status_due ON requests(status, due_ts)")
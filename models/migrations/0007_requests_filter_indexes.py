@@ -0,0 +1,9 @@
+"""
+Indexes for the remaining admin filters: department and priority on
+their own (status-leading indexes only help when status is also filtered).
+"""
+
+
+def upgrade(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_requests_department_status ON requests(department, status)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_requests_priority_status ON requests(priority, status)")
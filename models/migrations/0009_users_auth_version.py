@@ -0,0 +1,21 @@
+"""
+users.auth_version: stamped into access tokens at login (utils.auth).
+
+The trigger bumps it whenever a user's role changes, from any writer, so
+tokens carrying the old role stop verifying.
+"""
+
+
+def upgrade(conn):
+    conn.execute("ALTER TABLE users ADD COLUMN auth_version INTEGER NOT NULL DEFAULT 0")
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_users_auth_version
+        AFTER UPDATE OF role ON users
+        WHEN NEW.role IS NOT OLD.role
+        BEGIN
+            UPDATE users
+            SET auth_version = auth_version + 1
+            WHERE id = NEW.id;
+        END
+    """)
@@ -0,0 +1,23 @@
+"""
+revoked_tokens: access tokens (by JWT jti) revoked before they expire.
+
+id only grows (AUTOINCREMENT), so each worker can pull just the rows added
+since its last sync (utils.revocation). Rows are purged once the token
+would have expired anyway.
+"""
+
+
+def upgrade(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS revoked_tokens (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            jti TEXT NOT NULL UNIQUE,
+            user_id INTEGER,
+            expires_ts INTEGER NOT NULL,
+            revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_revoked_tokens_expires ON revoked_tokens(expires_ts)"
+    )
@@ -0,0 +1,24 @@
+"""
+kb_articles.content_html / content_hash: Markdown rendered once and stored.
+
+models.kb renders on seed (and on first view of a row without HTML). The
+trigger clears both columns whenever content changes, from any writer, so
+an edited article is re-rendered on its next view instead of serving
+stale HTML.
+"""
+
+
+def upgrade(conn):
+    conn.execute("ALTER TABLE kb_articles ADD COLUMN content_html TEXT")
+    conn.execute("ALTER TABLE kb_articles ADD COLUMN content_hash TEXT")
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_kb_articles_content_changed
+        AFTER UPDATE OF content ON kb_articles
+        WHEN NEW.content IS NOT OLD.content
+        BEGIN
+            UPDATE kb_articles
+            SET content_html = NULL, content_hash = NULL
+            WHERE id = NEW.id;
+        END
+    """)
@@ -0,0 +1,62 @@
+"""
+kb_articles_fts: FTS5 index over knowledge-base articles.
+
+External-content table (the text lives only in kb_articles), kept in step
+by triggers, so seeding or editing articles needs no extra calls. prefix
+indexes make search-as-you-type prefix queries index lookups.
+"""
+
+INDEXED = "title, summary, content, category"
+
+
+def upgrade(conn):
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS kb_articles_fts USING fts5(
+            {INDEXED},
+            content = 'kb_articles',
+            content_rowid = 'id',
+            tokenize = 'porter unicode61 remove_diacritics 2',
+            prefix = '2 3 4'
+        )
+    """)
+
+    new_values = ", ".join(f"NEW.{c}" for c in INDEXED.split(", "))
+    old_values = ", ".join(f"OLD.{c}" for c in INDEXED.split(", "))
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_kb_articles_fts_insert
+        AFTER INSERT ON kb_articles
+        BEGIN
+            INSERT INTO kb_articles_fts (rowid, {INDEXED})
+            VALUES (NEW.id, {new_values});
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_kb_articles_fts_delete
+        AFTER DELETE ON kb_articles
+        BEGIN
+            INSERT INTO kb_articles_fts (kb_articles_fts, rowid, {INDEXED})
+            VALUES ('delete', OLD.id, {old_values});
+        END
+    """)
+
+    # Only indexed columns: storing rendered HTML doesn't reindex
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_kb_articles_fts_update
+        AFTER UPDATE OF {INDEXED} ON kb_articles
+        BEGIN
+            INSERT INTO kb_articles_fts (kb_articles_fts, rowid, {INDEXED})
+            VALUES ('delete', OLD.id, {old_values});
+            INSERT INTO kb_articles_fts (rowid, {INDEXED})
+            VALUES (NEW.id, {new_values});
+        END
+    """)
+
+    # Search excludes unpublished articles by id; this keeps that list an index read
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_kb_articles_unpublished
+        ON kb_articles(id) WHERE is_published = 0
+    """)
+
+    conn.execute("INSERT INTO kb_articles_fts (kb_articles_fts) VALUES ('rebuild')")
@@ -0,0 +1,80 @@
+"""
+requests_fts: FTS5 index over requests for admin text search.
+
+Indexes request_type, admin_review_notes and the requester's email. The
+email lives on users, so this is a self-contained FTS table (rowid =
+requests.id) rather than an external-content one. Triggers on requests and
+users keep it current.
+"""
+
+BATCH_SIZE = 5000
+
+
+def upgrade(conn):
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS requests_fts USING fts5(
+            request_type,
+            admin_review_notes,
+            employee,
+            tokenize = 'porter unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_fts_insert
+        AFTER INSERT ON requests
+        BEGIN
+            INSERT INTO requests_fts (rowid, request_type, admin_review_notes, employee)
+            VALUES (
+                NEW.id,
+                NEW.request_type,
+                NEW.admin_review_notes,
+                (SELECT email FROM users WHERE id = NEW.user_id)
+            );
+        END
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_fts_update
+        AFTER UPDATE OF request_type, admin_review_notes, user_id ON requests
+        BEGIN
+            UPDATE requests_fts
+            SET request_type = NEW.request_type,
+                admin_review_notes = NEW.admin_review_notes,
+                employee = (SELECT email FROM users WHERE id = NEW.user_id)
+            WHERE rowid = NEW.id;
+        END
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_fts_delete
+        AFTER DELETE ON requests
+        BEGIN
+            DELETE FROM requests_fts WHERE rowid = OLD.id;
+        END
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_users_email_requests_fts
+        AFTER UPDATE OF email ON users
+        BEGIN
+            UPDATE requests_fts
+            SET employee = NEW.email
+            WHERE rowid IN (SELECT id FROM requests WHERE user_id = NEW.id);
+        END
+    """)
+
+    # Backfill in id ranges
+    max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM requests").fetchone()[0]
+    for start in range(0, max_id, BATCH_SIZE):
+        conn.execute(
+            """
+            INSERT INTO requests_fts (rowid, request_type, admin_review_notes, employee)
+            SELECT r.id, r.request_type, r.admin_review_notes, u.email
+            FROM requests r
+            LEFT JOIN users u ON u.id = r.user_id
+            WHERE r.id > ? AND r.id <= ?
+            """,
+            (start, start + BATCH_SIZE),
+        )
@@ -0,0 +1,102 @@
+"""
+request_daily: per-day rollups of requests for date-range analytics.
+
+One row per (day, category, department, priority, status), where day is
+the UTC creation date (rows from before priority had a default count as
+'medium'):
+
+- count             requests
+- completed         completed requests with both timestamps
+- completion_hours  SUM of their created -> reviewed hours
+- sla_met           completed by due_ts
+- sla_missed        completed after due_ts
+
+Like request_counters, triggers remove the OLD row's contribution and add
+the NEW one's, so the table stays exact for every writer (including the
+bulk importer). Analytics over any date range and filter reads a few
+hundred of these rows instead of the requests they summarize.
+"""
+
+DIMENSIONS = "day, category, department, priority, status"
+
+# Columns the rollups depend on; other updates (notes, reviewer) skip the trigger
+ROLLED_UP_COLUMNS = "status, category, department, priority, created_at, created_ts, reviewed_ts, due_ts"
+
+
+def _measures(row):
+    r = f"{row}." if row else ""
+    completed = f"({r}status = 'completed' AND {r}reviewed_ts IS NOT NULL AND {r}created_ts IS NOT NULL)"
+    return {
+        "count": "1",
+        "completed": f"{completed}",
+        "completion_hours": f"CASE WHEN {completed} THEN ({r}reviewed_ts - {r}created_ts) / 3600.0 ELSE 0 END",
+        "sla_met": f"({completed} AND {r}due_ts IS NOT NULL AND {r}reviewed_ts <= {r}due_ts)",
+        "sla_missed": f"({completed} AND {r}due_ts IS NOT NULL AND {r}reviewed_ts > {r}due_ts)",
+    }
+
+
+def _apply(row, sign):
+    measures = _measures(row)
+    columns = ", ".join(measures)
+    values = ", ".join(f"{sign} * ({expr})" for expr in measures.values())
+    updates = ",\n                ".join(f"{c} = {c} + excluded.{c}" for c in measures)
+    return f"""
+            INSERT INTO request_daily ({DIMENSIONS}, {columns})
+            SELECT date({row}.created_at), {row}.category, {row}.department,
+                   COALESCE({row}.priority, 'medium'), {row}.status,
+                   {values}
+            WHERE {row}.created_at IS NOT NULL
+            ON CONFLICT ({DIMENSIONS}) DO UPDATE
+            SET {updates};"""
+
+
+def upgrade(conn):
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS request_daily (
+            day TEXT NOT NULL,
+            category TEXT NOT NULL,
+            department TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            status TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            completion_hours REAL NOT NULL DEFAULT 0,
+            sla_met INTEGER NOT NULL DEFAULT 0,
+            sla_missed INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY ({DIMENSIONS})
+        ) WITHOUT ROWID
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_daily_insert
+        AFTER INSERT ON requests
+        BEGIN{_apply("NEW", 1)}
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_daily_delete
+        AFTER DELETE ON requests
+        BEGIN{_apply("OLD", -1)}
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_daily_update
+        AFTER UPDATE OF {ROLLED_UP_COLUMNS} ON requests
+        BEGIN{_apply("OLD", -1)}{_apply("NEW", 1)}
+        END
+    """)
+
+    # Backfill from existing rows
+    measures = _measures("")
+    conn.execute("DELETE FROM request_daily")
+    conn.execute(f"""
+        INSERT INTO request_daily ({DIMENSIONS}, {", ".join(measures)})
+        SELECT date(created_at) AS day, category, department,
+               COALESCE(priority, 'medium') AS priority, status,
+               {", ".join(f"SUM({expr})" for expr in measures.values())}
+        FROM requests
+        WHERE created_at IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 5
+    """)
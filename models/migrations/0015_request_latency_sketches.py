@@ -0,0 +1,109 @@
+"""
+request_latency: per-day quantile sketches of request latencies.
+
+Two metrics, recorded when the transition happens and bucketed by the
+UTC day it happened:
+
+- approval    created -> first moved out of pending into approved/in_progress
+- completion  created -> completed
+
+Each (day, category, department, priority, metric) keeps a log-bucketed
+histogram, one row per non-empty bucket (see models/quantiles.py). The
+triggers find a value's bucket in latency_buckets with one index seek, so
+they need no SQL math functions. The bucket layout is copied here from
+models/quantiles.py; changing it there needs a new migration that
+rebuilds latency_buckets and request_latency.
+
+These are event counts: deleting a request later does not remove its
+latencies. The migration backfills completions from completed rows;
+approval times of already-reviewed requests were never recorded, so that
+metric starts empty.
+"""
+import math
+
+# Bucket layout of models/quantiles.py: bucket i holds values up to GAMMA ** i
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+MAX_SECONDS = 10 * 365 * 86400
+MAX_BUCKET = math.ceil(math.log(MAX_SECONDS) / math.log(GAMMA))
+
+METRICS = {
+    "approval": "OLD.status = 'pending' AND NEW.status IN ('approved', 'in_progress')",
+    "completion": "OLD.status != 'completed' AND NEW.status = 'completed'",
+}
+
+_SECONDS = "(CAST(strftime('%s', R.reviewed_at) AS INTEGER) - R.created_ts)"
+
+_BUCKET = f"""COALESCE(
+                (SELECT bucket FROM latency_buckets
+                 WHERE upper_seconds >= {_SECONDS}
+                 ORDER BY upper_seconds LIMIT 1),
+                (SELECT MAX(bucket) FROM latency_buckets))"""
+
+
+def _record(metric, condition):
+    bucket = _BUCKET.replace("R.", "NEW.")
+    return f"""
+            INSERT INTO request_latency (day, category, department, priority, metric, bucket, count)
+            SELECT date(NEW.reviewed_at), NEW.category, NEW.department,
+                   COALESCE(NEW.priority, 'medium'), '{metric}', {bucket}, 1
+            WHERE {condition}
+              AND NEW.reviewed_at IS NOT NULL AND NEW.created_ts IS NOT NULL
+            ON CONFLICT (day, category, department, priority, metric, bucket) DO UPDATE
+            SET count = count + 1;"""
+
+
+def upgrade(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS latency_buckets (
+            bucket INTEGER PRIMARY KEY,
+            upper_seconds REAL NOT NULL UNIQUE
+        )
+    """)
+    conn.execute("DELETE FROM latency_buckets")
+    conn.executemany(
+        "INSERT INTO latency_buckets (bucket, upper_seconds) VALUES (?, ?)",
+        [(i, GAMMA ** i) for i in range(MAX_BUCKET + 1)],
+    )
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS request_latency (
+            day TEXT NOT NULL,
+            category TEXT NOT NULL,
+            department TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            bucket INTEGER NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, category, department, priority, metric, bucket)
+        ) WITHOUT ROWID
+    """)
+
+    # Status changes made by the app set reviewed_at in the same UPDATE
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_latency_update
+        AFTER UPDATE OF status ON requests
+        WHEN NEW.status != OLD.status
+        BEGIN{"".join(_record(m, c) for m, c in METRICS.items())}
+        END
+    """)
+
+    # Imported requests that arrive completed
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_latency_insert
+        AFTER INSERT ON requests
+        WHEN NEW.status = 'completed'
+        BEGIN{_record("completion", "1")}
+        END
+    """)
+
+    conn.execute("DELETE FROM request_latency")
+    bucket = _BUCKET.replace("R.", "")
+    conn.execute(f"""
+        INSERT INTO request_latency (day, category, department, priority, metric, bucket, count)
+        SELECT date(reviewed_at), category, department, COALESCE(priority, 'medium'),
+               'completion', {bucket} AS b, COUNT(*)
+        FROM requests
+        WHERE status = 'completed' AND reviewed_at IS NOT NULL AND created_ts IS NOT NULL
+        GROUP BY 1, 2, 3, 4, 6
+    """)
@@ -0,0 +1,79 @@
+"""
+request_events: append-only log of request status changes.
+
+One row per transition (and one for creation, from_status NULL), written
+by the route in the same transaction as the status change. stage_seconds
+is the time spent in from_status, i.e. since the request's previous
+event. Triggers reject UPDATE and DELETE.
+
+Indexed by (request_id, ts) for a request's history and by
+(from_status, ts, stage_seconds) so stage-duration aggregates over a date
+range read only the index. Totals per stage also go into request_counters
+(scope 'stage', key from_status, total = seconds) for O(1) dashboard
+reads.
+
+Existing requests are backfilled with their creation and current status;
+the path between them was never recorded. The backfill is written out
+here rather than calling models.request_events.backfill_events, so this
+migration keeps doing the same thing if that changes.
+"""
+
+
+def upgrade(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS request_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            request_id INTEGER NOT NULL,
+            ts INTEGER NOT NULL,
+            actor_id INTEGER,
+            from_status TEXT,
+            to_status TEXT NOT NULL,
+            stage_seconds INTEGER
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_request_events_request_ts ON request_events(request_id, ts)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_request_events_stage ON request_events(from_status, ts, stage_seconds)")
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_request_events_no_update
+        BEFORE UPDATE ON request_events
+        BEGIN
+            SELECT RAISE(ABORT, 'request_events is append-only');
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_request_events_no_delete
+        BEFORE DELETE ON request_events
+        BEGIN
+            SELECT RAISE(ABORT, 'request_events is append-only');
+        END
+    """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_request_events_stage_counters
+        AFTER INSERT ON request_events
+        WHEN NEW.from_status IS NOT NULL AND NEW.stage_seconds IS NOT NULL
+        BEGIN
+            INSERT INTO request_counters (scope, key, count, total)
+            VALUES ('stage', NEW.from_status, 1, NEW.stage_seconds)
+            ON CONFLICT (scope, key) DO UPDATE
+            SET count = count + 1,
+                total = total + excluded.total;
+        END
+    """)
+
+    # Creation of every request, then its current status if it moved on
+    conn.execute("""
+        INSERT INTO request_events (request_id, ts, actor_id, from_status, to_status)
+        SELECT id, created_ts, user_id, NULL, 'pending'
+        FROM requests
+        WHERE created_ts IS NOT NULL
+        ORDER BY id
+    """)
+    conn.execute("""
+        INSERT INTO request_events (request_id, ts, actor_id, from_status, to_status)
+        SELECT id, COALESCE(reviewed_ts, created_ts), reviewed_by, NULL, status
+        FROM requests
+        WHERE created_ts IS NOT NULL AND status != 'pending'
+        ORDER BY id
+    """)
@@ -0,0 +1,29 @@
+"""
+requests.version: a per-request revision number for optimistic
+concurrency.
+
+The app bumps it in the same UPDATE that changes a request (status
+transitions are compare-and-swap on status, and on version when the
+client sends If-Match), and exposes it as the request's ETag. The trigger
+bumps it for any other writer that changes a user-visible column without
+touching version; the timestamp and SLA columns maintained by triggers
+are not user-visible and do not count.
+"""
+
+VERSIONED_COLUMNS = (
+    "user_id, request_type, category, priority, department, status, "
+    "reviewed_at, reviewed_by, admin_review_notes"
+)
+
+
+def upgrade(conn):
+    conn.execute("ALTER TABLE requests ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_version
+        AFTER UPDATE OF {VERSIONED_COLUMNS} ON requests
+        WHEN NEW.version = OLD.version
+        BEGIN
+            UPDATE requests SET version = OLD.version + 1 WHERE id = NEW.id;
+        END
+    """)
@@ -0,0 +1,75 @@
+"""
+request_watermarks: a per-user change sequence for the user requests API.
+
+seq goes up whenever one of the user's requests is created, deleted, or
+changes a column the API returns. The API builds its ETag from this one
+row, so an unchanged history answers If-None-Match with 304 without
+re-reading the requests.
+
+SLA labels also change with time alone; idx_requests_user_active (open
+requests only) lets the API count the SLA boundaries they have passed
+from the index.
+"""
+
+# Columns the API returns or derives the SLA label from
+WATCHED_COLUMNS = (
+    "user_id, request_type, category, department, priority, status, "
+    "created_at, created_ts, due_ts, reviewed_at, admin_review_notes"
+)
+
+
+def _bump(user_id):
+    return f"""
+            INSERT INTO request_watermarks (user_id, seq)
+            VALUES ({user_id}, 1)
+            ON CONFLICT (user_id) DO UPDATE
+            SET seq = seq + 1;"""
+
+
+def upgrade(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS request_watermarks (
+            user_id INTEGER PRIMARY KEY,
+            seq INTEGER NOT NULL
+        )
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_watermark_insert
+        AFTER INSERT ON requests
+        BEGIN{_bump("NEW.user_id")}
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_watermark_delete
+        AFTER DELETE ON requests
+        BEGIN{_bump("OLD.user_id")}
+        END
+    """)
+
+    # A request moved to another user changes both histories
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_requests_watermark_update
+        AFTER UPDATE OF {WATCHED_COLUMNS} ON requests
+        BEGIN{_bump("NEW.user_id")}
+            INSERT INTO request_watermarks (user_id, seq)
+            SELECT OLD.user_id, 1
+            WHERE OLD.user_id != NEW.user_id
+            ON CONFLICT (user_id) DO UPDATE
+            SET seq = seq + 1;
+        END
+    """)
+
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_requests_user_active
+        ON requests(user_id, status, due_ts, created_ts)
+        WHERE status IN ('pending', 'in_progress')
+    """)
+
+    conn.execute("DELETE FROM request_watermarks")
+    conn.execute("""
+        INSERT INTO request_watermarks (user_id, seq)
+        SELECT DISTINCT user_id, 1
+        FROM requests
+    """)
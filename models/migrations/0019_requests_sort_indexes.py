@@ -0,0 +1,22 @@
+"""
+Indexes for the admin requests sort orders: every sort is (column, id),
+and an index on (column, id) serves it directly, unfiltered or after an
+equality filter on the same column. The (column, status) indexes from
+0007 only order by the column, leaving a temp B-tree sort over the
+whole table for the id tie-break.
+
+created_at needs none: idx_requests_created ends in the rowid already.
+"""
+
+
+INDEXES = {
+    "idx_requests_status_id": "requests(status, id)",
+    "idx_requests_category_id": "requests(category, id)",
+    "idx_requests_priority_id": "requests(priority, id)",
+    "idx_requests_department_id": "requests(department, id)",
+}
+
+
+def upgrade(conn):
+    for name, target in INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
@@ -0,0 +1,39 @@
+"""
+Approval time counter: request_counters scope 'approval', key 'all',
+count and total seconds of every move from pending to approved or
+in_progress (the same transitions request_latency calls approval).
+
+The 'stage' scope from 0016 totals all time spent in pending, denials
+included, so it cannot back the dashboard's average approval time.
+Backfilled from request_events.
+"""
+
+# R = NEW in the trigger, the table itself in the backfill
+APPROVAL = (
+    "R.from_status = 'pending' AND R.to_status IN ('approved', 'in_progress') "
+    "AND R.stage_seconds IS NOT NULL"
+)
+
+
+def upgrade(conn):
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_request_events_approval_counters
+        AFTER INSERT ON request_events
+        WHEN {APPROVAL.replace("R.", "NEW.")}
+        BEGIN
+            INSERT INTO request_counters (scope, key, count, total)
+            VALUES ('approval', 'all', 1, NEW.stage_seconds)
+            ON CONFLICT (scope, key) DO UPDATE
+            SET count = count + 1,
+                total = total + excluded.total;
+        END
+    """)
+
+    conn.execute("DELETE FROM request_counters WHERE scope = 'approval'")
+    conn.execute(f"""
+        INSERT INTO request_counters (scope, key, count, total)
+        SELECT 'approval', 'all', COUNT(*), COALESCE(SUM(stage_seconds), 0)
+        FROM request_events
+        WHERE {APPROVAL.replace("R.", "")}
+        HAVING COUNT(*) > 0
+    """)
@@ -0,0 +1,74 @@
+"""
+Drops request_counters scopes that nothing reads any more:
+
+- category_status  superseded by request_daily (0014)
+- completion       superseded by request_daily and request_latency (0014, 0015)
+- stage            superseded by the 'approval' scope (0020); stage
+                   durations are read from request_events itself
+
+The requests counter triggers from 0004 are recreated with the remaining
+scopes, so writes stop paying for the dropped ones.
+"""
+
+DROPPED_SCOPES = ("category_status", "completion", "stage")
+
+# As in 0004, less the dropped scopes; R = NEW or OLD
+COUNTER_SCOPES = [
+    ("status", "R.status", "0", "1"),
+    ("active_category", "R.category", "R.created_ts",
+     "R.status IN ('pending', 'in_progress') AND R.created_ts IS NOT NULL"),
+    ("day", "date(R.created_at)", "0", "R.created_at IS NOT NULL"),
+]
+
+# reviewed_ts only fed 'completion'
+COUNTED_COLUMNS = "status, category, created_at, created_ts"
+
+
+def _apply(row, sign):
+    statements = []
+    for scope, key, total, condition in COUNTER_SCOPES:
+        key, total, condition = (
+            expr.replace("R.", f"{row}.") for expr in (key, total, condition)
+        )
+        statements.append(f"""
+            INSERT INTO request_counters (scope, key, count, total)
+            SELECT '{scope}', {key}, {sign}, {sign} * ({total})
+            WHERE {condition}
+            ON CONFLICT (scope, key) DO UPDATE
+            SET count = count + excluded.count,
+                total = total + excluded.total;""")
+    return "".join(statements)
+
+
+def upgrade(conn):
+    for name in (
+        "trg_requests_counters_insert",
+        "trg_requests_counters_delete",
+        "trg_requests_counters_update",
+        "trg_request_events_stage_counters",
+    ):
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    conn.execute(f"""
+        CREATE TRIGGER trg_requests_counters_insert
+        AFTER INSERT ON requests
+        BEGIN{_apply("NEW", 1)}
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER trg_requests_counters_delete
+        AFTER DELETE ON requests
+        BEGIN{_apply("OLD", -1)}
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER trg_requests_counters_update
+        AFTER UPDATE OF {COUNTED_COLUMNS} ON requests
+        BEGIN{_apply("OLD", -1)}{_apply("NEW", 1)}
+        END
+    """)
+
+    placeholders = ", ".join("?" for _ in DROPPED_SCOPES)
+    conn.execute(f"DELETE FROM request_counters WHERE scope IN ({placeholders})", DROPPED_SCOPES)
@@ -0,0 +1,90 @@
+"""
+Versioned schema migrations.
+
+Each migration is a numbered module in this package (0001_initial_schema.py,
+0002_..., ...) exposing upgrade(conn). The number of the last applied
+migration is stored in PRAGMA user_version, so an up-to-date database costs
+one PRAGMA read at startup.
+"""
+import importlib
+import os
+import re
+
+from models.db import get_db_connection
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+_MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.py$")
+
+
+def discover_migrations():
+    """
+    Returns [(version, name)] sorted by version, read from file names only.
+    """
+    found = []
+    for filename in os.listdir(MIGRATIONS_DIR):
+        match = _MIGRATION_FILE.match(filename)
+        if match:
+            found.append((int(match.group(1)), filename[:-3]))
+    return sorted(found)
+
+
+def latest_version():
+    migrations = discover_migrations()
+    return migrations[-1][0] if migrations else 0
+
+
+def current_version(conn=None):
+    conn = conn or get_db_connection()
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending_migrations(conn=None):
+    version = current_version(conn)
+    return [(v, name) for v, name in discover_migrations() if v > version]
+
+
+def upgrade(conn=None, target=None):
+    """
+    Applies pending migrations in order, each in its own transaction.
+    Returns the list of applied migration names.
+    """
+    conn = conn or get_db_connection()
+    migrations = discover_migrations()
+    target = target if target is not None else (migrations[-1][0] if migrations else 0)
+
+    # Fast path: nothing to do
+    if current_version(conn) >= target:
+        return []
+
+    applied = []
+    for version, name in migrations:
+        if version > target:
+            break
+
+        # IMMEDIATE takes the write lock up front, so workers booting at the
+        # same time queue here and then see the version already bumped.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if current_version(conn) >= version:
+                conn.rollback()
+                continue
+
+            module = importlib.import_module(f"{__name__}.{name}")
+            module.upgrade(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        applied.append(name)
+
+    return applied
+
+
+def status(conn=None):
+    """
+    Returns [(version, name, applied)] for every known migration.
+    """
+    version = current_version(conn)
+    return [(v, name, v <= version) for v, name in discover_migrations()]
@@ -0,0 +1,38 @@
+"""
+Usage:
+    python -m models.migrations status
+    python -m models.migrations upgrade [--target N]
+"""
+import argparse
+
+from models.migrations import current_version, status, upgrade
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m models.migrations")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("status", help="list migrations and whether they are applied")
+
+    up = sub.add_parser("upgrade", help="apply pending migrations")
+    up.add_argument("--target", type=int, default=None)
+
+    args = parser.parse_args()
+
+    if args.command == "status":
+        print(f"user_version = {current_version()}")
+        for version, name, applied in status():
+            print(f"  [{'x' if applied else ' '}] {name}")
+        return
+
+    applied = upgrade(target=args.target)
+    if applied:
+        for name in applied:
+            print(f"✅ Applied {name}")
+    else:
+        print("ℹ️ Database already up to date")
+    print(f"user_version = {current_version()}")
+
+
+if __name__ == "__main__":
+    main()
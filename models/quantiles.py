@@ -0,0 +1,62 @@
+"""
+Log-bucketed quantile sketches (DDSketch style) for request latencies.
+
+A value of v seconds falls in bucket i, the smallest i with
+GAMMA ** i >= v; values of a second or less go in bucket 0. Estimating a
+quantile as the midpoint of its bucket is then within RELATIVE_ACCURACY
+of the true value, whatever the distribution, and two sketches merge by
+adding their bucket counts. That is what lets request_latency (see
+migrations/0015_request_latency_sketches.py) keep one small sketch per
+day and answer any date range with SUM(count) ... GROUP BY bucket.
+"""
+import math
+
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+
+# Ten years; anything longer is counted in the last bucket
+MAX_SECONDS = 10 * 365 * 86400
+MAX_BUCKET = math.ceil(math.log(MAX_SECONDS) / math.log(GAMMA))
+
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+def bucket_bounds():
+    """
+    (bucket, upper bound in seconds) for every bucket, for the lookup
+    table the triggers use.
+    """
+    return [(i, GAMMA ** i) for i in range(MAX_BUCKET + 1)]
+
+
+def bucket_value(bucket):
+    """
+    Representative value of a bucket: the point within RELATIVE_ACCURACY
+    of both its bounds.
+    """
+    if bucket == 0:
+        return 1.0
+    return 2 * GAMMA ** bucket / (GAMMA + 1)
+
+
+def quantiles(counts, qs=PERCENTILES):
+    """
+    Estimates quantiles from merged bucket counts ({bucket: count}).
+    Returns {q: seconds}, or None if the sketch is empty.
+    """
+    total = sum(counts.values())
+    if total <= 0:
+        return None
+
+    buckets = sorted(b for b, c in counts.items() if c > 0)
+    result = {}
+    for q in sorted(qs):
+        # Rank of the q-quantile among `total` values, 0-based
+        rank = q * (total - 1)
+        seen = 0
+        for b in buckets:
+            seen += counts[b]
+            if seen > rank:
+                result[q] = bucket_value(b)
+                break
+    return result
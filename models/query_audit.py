@@ -0,0 +1,220 @@
+"""
+Query-plan audit for the requests table.
+
+Runs the app against a scratch database, records every statement it issues
+(via models.db.QUERY_TRACE), then runs EXPLAIN QUERY PLAN on each one and
+reports any that SCAN requests instead of searching an index, or that sort
+in a temp B-tree (USE TEMP B-TREE) instead of reading an index in order.
+
+A query that must read the whole table or sort on purpose can opt out with
+a comment in its SQL:  /* full-scan: <reason> */  or  /* temp-sort: <reason> */
+
+Usage:
+    python -m models.query_audit          # exits 1 if any query scans or sorts requests
+"""
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+
+from models import db
+
+FULL_SCAN_MARKER = "/* full-scan:"
+TEMP_SORT_MARKER = "/* temp-sort:"
+
+_SKIP_PREFIXES = ("PRAGMA", "BEGIN", "COMMIT", "ROLLBACK", "CREATE", "ALTER", "DROP", "SAVEPOINT", "RELEASE")
+_REQUESTS_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+requests\b(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_NOT_ALIASES = {"where", "join", "left", "inner", "cross", "on", "order", "group", "limit", "set", "using", "indexed", "not"}
+
+
+def _strip_comments(sql):
+    return re.sub(r"/\*.*?\*/|--[^\n]*", "", sql, flags=re.DOTALL).strip()
+
+
+def requests_aliases(sql):
+    aliases = {"requests"}
+    for match in _REQUESTS_ALIAS.finditer(sql):
+        alias = match.group(1)
+        if alias and alias.lower() not in _NOT_ALIASES:
+            aliases.add(alias)
+    return aliases
+
+
+def explain(conn, sql):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def requests_problems(conn, sql):
+    """
+    Returns the plan lines in which sql scans the requests table or sorts
+    in a temp B-tree, less those its markers allow.
+    """
+    aliases = requests_aliases(sql)
+    problems = []
+    for detail in explain(conn, sql):
+        match = re.match(r"SCAN (\w+)", detail)
+        if match and match.group(1) in aliases and FULL_SCAN_MARKER not in sql:
+            problems.append(detail)
+        elif "TEMP B-TREE" in detail and TEMP_SORT_MARKER not in sql:
+            problems.append(detail)
+    return problems
+
+
+def audit(conn, statements):
+    """
+    Returns [(sql, plan_lines)] for statements on requests that scan it or
+    sort without the matching marker.
+    """
+    offenders = []
+    for sql in sorted(statements):
+        body = _strip_comments(sql)
+        if not body or body.upper().startswith(_SKIP_PREFIXES):
+            continue
+        if "requests" not in body.lower():
+            continue
+
+        problems = requests_problems(conn, sql)
+        if problems:
+            offenders.append((sql, problems))
+    return offenders
+
+
+# - - - - - - - - - - - - - -
+# Exercising the app
+# - - - - - - - - - - - - - -
+def _seed_sample_requests(conn):
+    user_id = conn.execute("SELECT id FROM users WHERE role = 'user' LIMIT 1").fetchone()[0]
+    rows = [
+        (user_id, f"Sample {i}", category, priority, status)
+        for i, (category, priority, status) in enumerate([
+            ("Access", "high", "pending"),
+            ("Hardware", "medium", "in_progress"),
+            ("Software", "low", "completed"),
+            ("Security", "high", "denied"),
+        ])
+    ]
+    conn.executemany(
+        """
+        INSERT INTO requests (user_id, request_type, category, priority, status)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    conn.execute("UPDATE requests SET reviewed_at = CURRENT_TIMESTAMP WHERE status = 'completed'")
+    conn.commit()
+
+
+def _get_urls(app):
+    urls = []
+    for rule in app.url_map.iter_rules():
+        if "GET" not in rule.methods or rule.arguments or rule.endpoint == "static":
+            continue
+        if rule.rule.startswith("/dashboard/tools/"):
+            continue  # external redirects
+        urls.append(rule.rule)
+    return sorted(urls)
+
+
+# Parametrized / filtered pages that the url_map walk can't produce
+EXTRA_URLS = [
+    "/dashboard/user/knowledge-base/article/password-reset-process",
+    "/dashboard/admin/requests?status=pending",
+    "/dashboard/admin/requests?sla=overdue",
+    "/dashboard/admin/requests?due_within=24",
+    "/dashboard/admin/requests?category=Access&priority=high&sort=priority&dir=asc",
+    "/dashboard/admin/requests?department=corporate&sort=department",
+    "/dashboard/admin/requests?date_from=2020-01-01&date_to=2099-12-31",
+    "/dashboard/admin/requests?sort=status&cursor=WyJwZW5kaW5nIiwgMV0",
+    "/dashboard/admin/requests?sort=status",
+    "/dashboard/admin/requests?sort=category&dir=asc",
+    "/dashboard/admin/requests?sort=priority",
+    "/dashboard/admin/requests?sort=department&dir=asc",
+    "/dashboard/admin/requests?sort=id",
+    "/dashboard/admin/requests/export?format=ndjson&status=pending",
+    "/dashboard/admin/requests?q=audit&status=pending",
+    "/dashboard/admin/requests/search?q=audi",
+    "/dashboard/admin/requests/search?q=user%40example&category=Access",
+    "/dashboard/admin/analytics?date_from=2020-01-01&date_to=2099-12-31&department=corporate",
+    "/dashboard/admin/analytics?category=Access&priority=high&status=completed",
+    "/requests/requests/1",
+    "/dashboard/admin/live?after=0",
+    "/dashboard/api/user/requests?status=pending&category=Access&limit=5",
+]
+
+
+def _login(client, email, password):
+    client.delete_cookie("access_token")
+    client.post("/auth/login", json={"email": email, "password": password})
+
+
+def capture_app_queries():
+    """
+    Runs the app's pages as both roles on a scratch DB.
+    Returns (db_path, set of traced statements).
+    """
+    statements = set()
+    db_path = os.path.join(tempfile.mkdtemp(prefix="query_audit_"), "audit.db")
+
+    from app import create_app
+    from models.cli import upgrade_and_seed
+
+    app = create_app({
+        "JWT_COOKIE_SECURE": False,
+        "DATABASE": db_path,
+        # The admin live feed streams until this; one poll is enough
+        "ADMIN_LIVE_MAX_SECONDS": 0.5,
+    })
+
+    # Migrations and seeding are one-off; trace only what the pages issue
+    with app.app_context():
+        upgrade_and_seed()
+        _seed_sample_requests(db.get_db_connection())
+
+    db.QUERY_TRACE = statements.add
+    with app.app_context():
+        db.get_db_connection().set_trace_callback(statements.add)
+
+    client = app.test_client()
+    urls = _get_urls(app) + EXTRA_URLS
+
+    _login(client, "user@example.com", "user123")
+    client.post("/requests/requests", data={"request_type": "Audit", "category": "Access"})
+    for url in urls:
+        client.get(url).get_data()  # runs streamed bodies too
+
+    _login(client, "admin@example.com", "admin123")
+    for url in urls:
+        client.get(url).get_data()  # runs streamed bodies too
+    client.post("/requests/requests/1/review", data={"action": "approve"})
+    client.post("/requests/requests/bulk-review", json={"ids": [1, 2], "action": "complete"})
+
+    db.QUERY_TRACE = None
+    db.close_db_connection()
+    return db_path, statements
+
+
+def main():
+    db_path, statements = capture_app_queries()
+
+    conn = sqlite3.connect(db_path)
+    offenders = audit(conn, statements)
+    conn.close()
+
+    print(f"Audited {len(statements)} distinct statements")
+
+    if not offenders:
+        print("✅ No query scans or sorts the requests table")
+        return 0
+
+    for sql, scans in offenders:
+        print("\n❌ " + " ".join(sql.split()))
+        for line in scans:
+            print(f"     {line}")
+
+    print(f"\n{len(offenders)} queries scan or sort requests")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
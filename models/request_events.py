@@ -0,0 +1,115 @@
+"""
+Append-only history of request status changes (request_events, see
+migrations/0016_request_events.py).
+
+Every event stores how long the request spent in the status it is
+leaving (stage_seconds), computed once when the event is written, so
+"time in pending" and "time in progress" are plain aggregates over the
+(from_status, ts) index rather than reconstructions from the history.
+Writers call record_event inside the transaction that changes the
+status.
+"""
+import time
+
+# Statuses a request can sit in; time spent in each is tracked
+STAGES = ("pending", "approved", "in_progress")
+
+
+# from_status defaults to the status the previous event moved the request
+# to, i.e. its status before this change
+_EVENT_SQL = """
+    INSERT INTO request_events
+        (request_id, ts, actor_id, from_status, to_status, stage_seconds)
+    VALUES (?, ?, ?, COALESCE(?, (
+        SELECT to_status FROM request_events
+        WHERE request_id = ?
+        ORDER BY ts DESC, id DESC
+        LIMIT 1
+    )), ?, ? - (
+        SELECT ts FROM request_events
+        WHERE request_id = ?
+        ORDER BY ts DESC, id DESC
+        LIMIT 1
+    ))
+"""
+
+
+def record_events(conn, events, ts=None):
+    """
+    Appends events given as (request_id, to_status, actor_id, from_status)
+    with executemany, all stamped `ts` (default now). Does not commit.
+    """
+    if ts is None:
+        ts = int(time.time())
+
+    conn.executemany(
+        _EVENT_SQL,
+        (
+            (request_id, ts, actor_id, from_status, request_id, to_status, ts, request_id)
+            for request_id, to_status, actor_id, from_status in events
+        )
+    )
+
+
+def record_event(conn, request_id, to_status, actor_id, from_status=None, ts=None):
+    """
+    Appends one event. Leave from_status None for creation, or to take it
+    from the request's previous event. Does not commit.
+    """
+    record_events(conn, [(request_id, to_status, actor_id, from_status)], ts)
+
+
+def backfill_events(conn, after_id=0):
+    """
+    Writes the history known for requests with id > after_id that have no
+    events yet: their creation and, if they have moved on, their current
+    status (how they got there is unknown, so from_status and
+    stage_seconds are NULL). Does not commit.
+    """
+    conn.execute(
+        """
+        INSERT INTO request_events (request_id, ts, actor_id, from_status, to_status)
+        SELECT r.id, r.created_ts, r.user_id, NULL, 'pending'
+        FROM requests r
+        WHERE r.id > ? AND r.created_ts IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM request_events e WHERE e.request_id = r.id)
+        ORDER BY r.id
+        """,
+        (after_id,)
+    )
+    conn.execute(
+        """
+        INSERT INTO request_events (request_id, ts, actor_id, from_status, to_status)
+        SELECT r.id, COALESCE(r.reviewed_ts, r.created_ts), r.reviewed_by, NULL, r.status
+        FROM requests r
+        WHERE r.id > ? AND r.created_ts IS NOT NULL AND r.status != 'pending'
+          AND NOT EXISTS (
+              SELECT 1 FROM request_events e
+              WHERE e.request_id = r.id AND e.to_status != 'pending'
+          )
+        ORDER BY r.id
+        """,
+        (after_id,)
+    )
+
+
+def stage_durations(conn, since_ts=None, until_ts=None):
+    """
+    Time spent in each of STAGES by requests that left it in
+    [since_ts, until_ts). Returns {stage: {"count", "avg_hours"}}.
+    """
+    durations = {}
+    for stage in STAGES:
+        row = conn.execute(
+            """
+            SELECT COUNT(stage_seconds) AS n, AVG(stage_seconds) AS avg_seconds
+            FROM request_events
+            WHERE from_status = ? AND ts >= ? AND ts < ?
+            """,
+            (stage, since_ts or 0, until_ts or 2**62)
+        ).fetchone()
+        durations[stage] = {
+            "count": row["n"],
+            "avg_hours": row["avg_seconds"] / 3600 if row["n"] else None,
+        }
+    return durations
@@ -0,0 +1,173 @@
+"""
+Query-parameter filters, sorting and keyset pagination for admin views of
+requests (the admin requests page, exports, search).
+
+Everything here builds SQL fragments against `requests r` joined to
+`users u` (requester); values always travel as ? parameters.
+"""
+import time
+from datetime import datetime, timedelta
+
+from rules.request_rules import VALID_CATEGORIES, VALID_STATUSES, VALID_PRIORITIES
+from rules.sla_rules import sla_filter_sql
+from models.fts import fts_query
+from utils.pagination import encode_cursor, decode_cursor
+
+# Exact-match filters: query param -> (column, allowed values or None)
+EQUALITY_FILTERS = {
+    "status": ("r.status", VALID_STATUSES),
+    "category": ("r.category", VALID_CATEGORIES),
+    "priority": ("r.priority", VALID_PRIORITIES),
+    "department": ("r.department", None),
+    "employee": ("u.email", None),
+    "reviewed_by": ("r.reviewed_by", None),
+}
+
+SLA_VALUES = ("overdue", "at_risk", "on_time")
+
+# Largest ?due_within= accepted (ten years)
+MAX_DUE_WITHIN_HOURS = 10 * 365 * 24
+
+# Sortable columns: query param -> column (all NOT NULL, so keyset row
+# comparisons are well defined)
+SORT_COLUMNS = {
+    "created_at": "r.created_at",
+    "status": "r.status",
+    "category": "r.category",
+    "priority": "r.priority",
+    "department": "r.department",
+    "id": "r.id",
+}
+
+DEFAULT_SORT = "created_at"
+
+
+class FilterError(ValueError):
+    pass
+
+
+def _day(value, name):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise FilterError(f"{name} must be YYYY-MM-DD")
+
+
+def parse_filters(args, now=None):
+    """
+    Reads filters from request args (a MultiDict or dict).
+
+    Returns (where, params, selected): SQL conditions to AND together,
+    their parameters, and the normalized filter values for templates.
+    'all' or an empty value means no filter. Raises FilterError.
+    """
+    if now is None:
+        now = time.time()
+
+    where = []
+    params = []
+    selected = {}
+
+    for name, (column, allowed) in EQUALITY_FILTERS.items():
+        value = (args.get(name) or "").strip()
+        if not value or value == "all":
+            continue
+        if allowed is not None and value not in allowed:
+            raise FilterError(f"invalid {name}")
+        where.append(f"{column} = ?")
+        params.append(value)
+        selected[name] = value
+
+    # Free text over request type, review notes and requester email
+    q = args.get("q") or ""
+    match = fts_query(q)
+    if match:
+        where.append("r.id IN (SELECT rowid FROM requests_fts WHERE requests_fts MATCH ?)")
+        params.append(match)
+        selected["q"] = q
+
+    sla = args.get("sla") or "all"
+    if sla != "all":
+        if sla not in SLA_VALUES:
+            raise FilterError("invalid sla")
+        sla_sql, sla_params = sla_filter_sql(sla, now, alias="r")
+        where.append(sla_sql)
+        params += sla_params
+        selected["sla"] = sla
+
+    due_within = args.get("due_within")
+    if due_within:
+        try:
+            hours = int(due_within)
+        except ValueError:
+            raise FilterError("due_within must be a number of hours")
+        # Bounded so now + hours stays a 64-bit SQLite integer
+        if not 0 <= hours <= MAX_DUE_WITHIN_HOURS:
+            raise FilterError(f"due_within must be between 0 and {MAX_DUE_WITHIN_HOURS} hours")
+        where.append("r.status IN ('pending', 'in_progress') AND r.due_ts >= ? AND r.due_ts < ?")
+        params += [int(now), int(now) + hours * 3600]
+        selected["due_within"] = hours
+
+    # created_at text (CURRENT_TIMESTAMP format) sorts like the time, so
+    # idx_requests_created serves both the range and the default order
+    date_from = args.get("date_from")
+    if date_from:
+        where.append("r.created_at >= ?")
+        params.append(_day(date_from, "date_from").strftime("%Y-%m-%d"))
+        selected["date_from"] = date_from
+
+    date_to = args.get("date_to")
+    if date_to:
+        # Inclusive: everything before the start of the following day
+        where.append("r.created_at < ?")
+        params.append((_day(date_to, "date_to") + timedelta(days=1)).strftime("%Y-%m-%d"))
+        selected["date_to"] = date_to
+
+    return where, params, selected
+
+
+def parse_sort(args):
+    """
+    Returns (sort_key, direction) from ?sort=&dir=. Raises FilterError.
+    """
+    sort = args.get("sort") or DEFAULT_SORT
+    direction = (args.get("dir") or "desc").lower()
+
+    if sort not in SORT_COLUMNS:
+        raise FilterError("invalid sort")
+    if direction not in ("asc", "desc"):
+        raise FilterError("invalid dir")
+    return sort, direction
+
+
+def order_by_sql(sort, direction):
+    column = SORT_COLUMNS[sort]
+    if column == "r.id":
+        return f"r.id {direction.upper()}"
+    return f"{column} {direction.upper()}, r.id {direction.upper()}"
+
+
+def keyset_sql(sort, direction, cursor):
+    """
+    WHERE fragment continuing after `cursor` in the given order.
+    Returns (sql, params). Raises FilterError on a malformed cursor.
+    """
+    column = SORT_COLUMNS[sort]
+    op = "<" if direction == "desc" else ">"
+
+    if column == "r.id":
+        values = decode_cursor(cursor, (int,))
+        if values is None:
+            raise FilterError("invalid cursor")
+        return f"r.id {op} ?", values
+
+    values = decode_cursor(cursor, (str, int))
+    if values is None:
+        raise FilterError("invalid cursor")
+    return f"({column}, r.id) {op} (?, ?)", values
+
+
+def next_cursor(row, sort):
+    if sort == "id":
+        return encode_cursor(row["id"])
+    return encode_cursor(row[sort], row["id"])
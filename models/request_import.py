@@ -0,0 +1,325 @@
+"""
+Bulk import of historical requests from a JSONL dump.
+
+One JSON object per line:
+
+    {"employee": "jane@example.com", "request_type": "VPN access",
+     "category": "Access", "priority": "high", "department": "corporate",
+     "status": "completed", "created_at": "2024-03-01 09:15:00",
+     "reviewed_at": "2024-03-02 10:00:00", "reviewed_by": "admin@example.com",
+     "admin_review_notes": "Granted"}
+
+employee, request_type, category and created_at are required; the rest
+default like a new request. Employees and reviewers are looked up by email
+and must already exist.
+
+Rows go in with executemany, one transaction per batch. created_ts,
+reviewed_ts and due_ts are computed here, so the timestamp and SLA
+triggers never fire. Each batch also writes the rows' request_events
+(creation and current status). Secondary indexes on requests are dropped for the
+load and rebuilt once at the end. Each batch's transaction also records
+the byte offset reached in import_checkpoints, so an interrupted import
+resumes exactly where it stopped and still rebuilds the indexes it
+dropped.
+
+    flask --app app import-requests dump.jsonl
+"""
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+from models.db import get_db_connection
+from models.request_events import backfill_events
+from rules.request_rules import VALID_CATEGORIES, VALID_STATUSES, VALID_PRIORITIES
+from rules.sla_rules import sla_due_ts
+
+BATCH_SIZE = 10000
+
+# Statuses that only exist after an admin has acted
+REVIEWED_STATUSES = {"approved", "in_progress", "denied", "completed"}
+
+INSERT_SQL = """
+    INSERT INTO requests (
+        user_id,
+        request_type,
+        category,
+        priority,
+        department,
+        status,
+        created_at,
+        created_ts,
+        reviewed_at,
+        reviewed_ts,
+        reviewed_by,
+        admin_review_notes,
+        due_ts
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class RecordError(ValueError):
+    pass
+
+
+def _parse_time(value, name):
+    """
+    Returns (created_at text in CURRENT_TIMESTAMP format, epoch seconds).
+    Naive times are taken as UTC, like the rest of the schema.
+    """
+    if not isinstance(value, str):
+        raise RecordError(f"{name} must be a string")
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise RecordError(f"{name} is not an ISO date/time")
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime("%Y-%m-%d %H:%M:%S"), int(parsed.timestamp())
+
+
+def record_to_row(record, user_ids):
+    """
+    Validates one decoded JSONL record and returns the INSERT_SQL
+    parameters. user_ids maps email -> users.id. Raises RecordError.
+    """
+    if not isinstance(record, dict):
+        raise RecordError("line is not a JSON object")
+
+    for field in ("employee", "request_type", "category", "created_at"):
+        if not record.get(field):
+            raise RecordError(f"missing {field}")
+
+    user_id = user_ids.get(record["employee"])
+    if user_id is None:
+        raise RecordError(f"unknown employee {record['employee']}")
+
+    category = record["category"]
+    if category not in VALID_CATEGORIES:
+        raise RecordError(f"invalid category {category}")
+
+    priority = record.get("priority") or "medium"
+    if priority not in VALID_PRIORITIES:
+        raise RecordError(f"invalid priority {priority}")
+
+    status = record.get("status") or "pending"
+    if status not in VALID_STATUSES:
+        raise RecordError(f"invalid status {status}")
+
+    created_at, created_ts = _parse_time(record["created_at"], "created_at")
+
+    reviewed_at = reviewed_ts = reviewed_by = None
+    if record.get("reviewed_at"):
+        reviewed_at, reviewed_ts = _parse_time(record["reviewed_at"], "reviewed_at")
+        if reviewed_ts < created_ts:
+            raise RecordError("reviewed_at is before created_at")
+    elif status in ("denied", "completed"):
+        raise RecordError(f"{status} request needs reviewed_at")
+
+    if status in REVIEWED_STATUSES and record.get("reviewed_by"):
+        reviewed_by = user_ids.get(record["reviewed_by"])
+        if reviewed_by is None:
+            raise RecordError(f"unknown reviewer {record['reviewed_by']}")
+
+    return (
+        user_id,
+        record["request_type"],
+        category,
+        priority,
+        record.get("department") or "corporate",
+        status,
+        created_at,
+        created_ts,
+        reviewed_at,
+        reviewed_ts,
+        reviewed_by,
+        record.get("admin_review_notes"),
+        sla_due_ts(priority, created_ts),
+    )
+
+
+# - - - - - - - - - - - - - -
+# Checkpoints
+# - - - - - - - - - - - - - -
+def read_checkpoint(conn, source):
+    row = conn.execute(
+        """
+        SELECT byte_offset, lines, imported, rejected, deferred_indexes
+        FROM import_checkpoints
+        WHERE source = ?
+        """,
+        (source,)
+    ).fetchone()
+
+    if row is None:
+        return None
+    return {
+        "offset": row["byte_offset"],
+        "lines": row["lines"],
+        "imported": row["imported"],
+        "rejected": row["rejected"],
+        "indexes": json.loads(row["deferred_indexes"]),
+    }
+
+
+def write_checkpoint(conn, source, state):
+    """
+    Saves progress; call inside the transaction that inserted the rows.
+    """
+    conn.execute(
+        """
+        INSERT INTO import_checkpoints
+            (source, byte_offset, lines, imported, rejected, deferred_indexes, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT (source) DO UPDATE SET
+            byte_offset = excluded.byte_offset,
+            lines = excluded.lines,
+            imported = excluded.imported,
+            rejected = excluded.rejected,
+            deferred_indexes = excluded.deferred_indexes,
+            updated_at = excluded.updated_at
+        """,
+        (source, state["offset"], state["lines"], state["imported"],
+         state["rejected"], json.dumps(state["indexes"]))
+    )
+
+
+# - - - - - - - - - - - - - -
+# Deferred indexes
+# - - - - - - - - - - - - - -
+def drop_request_indexes(conn):
+    """
+    Drops the secondary indexes on requests and returns their CREATE
+    statements. Runs inside the caller's transaction.
+    """
+    rows = conn.execute(
+        """
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND tbl_name = 'requests' AND sql IS NOT NULL
+        ORDER BY name
+        """
+    ).fetchall()
+
+    for row in rows:
+        conn.execute(f"DROP INDEX {row['name']}")
+
+    return [row["sql"] for row in rows]
+
+
+def rebuild_indexes(conn, statements):
+    """
+    Recreates dropped indexes. Runs inside the caller's transaction.
+    """
+    for sql in statements:
+        conn.execute(sql)
+
+
+# - - - - - - - - - - - - - -
+# Import
+# - - - - - - - - - - - - - -
+def import_requests(path, batch_size=BATCH_SIZE, defer_indexes=True,
+                    restart=False, progress=None, conn=None):
+    """
+    Streams the JSONL file at `path` into requests.
+
+    progress(stats) is called after every committed batch. Returns the
+    final stats dict: lines, imported, rejected, errors (first 20, as
+    (line number, message)), seconds, rows_per_sec.
+    """
+    conn = conn or get_db_connection()
+    source = os.path.abspath(path)
+
+    state = read_checkpoint(conn, source)
+    if state is None or restart:
+        # Indexes an interrupted run dropped still need rebuilding
+        indexes = state["indexes"] if state else []
+        state = {"offset": 0, "lines": 0, "imported": 0, "rejected": 0, "indexes": indexes}
+
+    user_ids = {
+        row["email"]: row["id"]
+        for row in conn.execute("SELECT id, email FROM users")
+    }
+
+    remaining = os.path.getsize(path) - state["offset"]
+    if defer_indexes and not state["indexes"] and remaining > 0:
+        conn.execute("BEGIN IMMEDIATE")
+        state["indexes"] = drop_request_indexes(conn)
+        write_checkpoint(conn, source, state)
+        conn.commit()
+
+    errors = []
+    started = time.perf_counter()
+    imported_at_start = state["imported"]
+
+    def flush(batch):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM requests").fetchone()[0]
+            conn.executemany(INSERT_SQL, batch)
+            backfill_events(conn, after_id=last_id)
+            state["imported"] += len(batch)
+            write_checkpoint(conn, source, state)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        if progress:
+            progress(_stats(state, errors, started, imported_at_start))
+
+    with open(path, "rb") as f:
+        f.seek(state["offset"])
+        batch = []
+        offset = state["offset"]
+        line_no = state["lines"]
+
+        for raw in f:
+            offset += len(raw)
+            line_no += 1
+
+            if raw.strip():
+                try:
+                    batch.append(record_to_row(json.loads(raw), user_ids))
+                except (ValueError, RecordError) as e:
+                    state["rejected"] += 1
+                    if len(errors) < 20:
+                        errors.append((line_no, str(e)))
+
+            if len(batch) >= batch_size:
+                state["offset"], state["lines"] = offset, line_no
+                flush(batch)
+                batch = []
+
+        state["offset"], state["lines"] = offset, line_no
+        if batch:
+            flush(batch)
+
+    # The checkpoint stays at end of file: running the same dump again
+    # imports nothing unless --restart is given.
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        rebuild_indexes(conn, state["indexes"])
+        state["indexes"] = []
+        write_checkpoint(conn, source, state)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return _stats(state, errors, started, imported_at_start)
+
+
+def _stats(state, errors, started, imported_at_start):
+    seconds = time.perf_counter() - started
+    imported_now = state["imported"] - imported_at_start
+    return {
+        "lines": state["lines"],
+        "imported": state["imported"],
+        "rejected": state["rejected"],
+        "errors": list(errors),
+        "seconds": seconds,
+        "rows_per_sec": imported_now / seconds if seconds else 0,
+    }
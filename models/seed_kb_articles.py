@@ -1,6 +1,5 @@
 from models.db import get_db_connection
-
-print("seed_kb_articles module loaded")
+from models.kb import store_rendered
 
 
 KB_ARTICLES = [
@@ -267,4 +266,11 @@ def seed_kb_articles():
             )
         )
 
+    # Render Markdown for new articles (and any edited since last render)
+    pending = cursor.execute(
+        "SELECT id, content FROM kb_articles WHERE content_hash IS NULL"
+    ).fetchall()
+    for row in pending:
+        store_rendered(db, row["id"], row["content"])
+
     db.commit()
\ No newline at end of file
@@ -1,4 +1,5 @@
 from models.db import get_db_connection
+from models.request_events import backfill_events
 
 def seed_request():
     conn = get_db_connection()
@@ -14,6 +15,7 @@ def seed_request():
         "Access",
         "pending"
     ))
+    backfill_events(conn, after_id=cur.lastrowid - 1)
 
     conn.commit()
     conn.close()
@@ -1,10 +1,12 @@
 print("✅ admin_settings routes loaded")
 
 from flask import redirect, url_for, request, abort
-from flask_jwt_extended import jwt_required
+from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from routes.dashboard import dashboard_bp
 from routes.auth import admin_required
+from models.db import get_db_connection
+from utils.auth import invalidate_auth_version
 
 
 # -------- Categories --------
@@ -43,8 +45,40 @@ def toggle_user_role():
     user_id = request.form.get("user_id")
     new_role = request.form.get("new_role")
 
-    if not user_id or not new_role:
+    if not user_id or new_role not in ("user", "admin"):
         abort(400)
 
-    return redirect(url_for("dashboard.admin_settings_page"))
+    try:
+        user_id = int(user_id)
+    except ValueError:
+        abort(400)
+
+    # Admins can't demote themselves (and lock themselves out)
+    if new_role != "admin" and user_id == int(get_jwt_identity()):
+        abort(400)
+
+    conn = get_db_connection()
+    if conn.execute("SELECT 1 FROM users WHERE id = ?", (user_id,)).fetchone() is None:
+        conn.close()
+        abort(404)
 
+    # trg_users_auth_version bumps auth_version, retiring the user's tokens.
+    # Never demotes the last admin, even against a concurrent demotion.
+    cur = conn.execute(
+        """
+        UPDATE users SET role = ?
+        WHERE id = ?
+          AND (? = 'admin' OR role != 'admin'
+               OR (SELECT COUNT(*) FROM users WHERE role = 'admin') > 1)
+        """,
+        (new_role, user_id, new_role)
+    )
+    conn.commit()
+    conn.close()
+
+    if cur.rowcount == 0:
+        abort(409)
+
+    invalidate_auth_version(user_id)
+
+    return redirect(url_for("dashboard.admin_settings_page"))
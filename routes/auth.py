@@ -1,14 +1,17 @@
-from flask import Blueprint, request, jsonify, redirect, make_response, abort, url_for
+from flask import Blueprint, request, jsonify, redirect, make_response, url_for
 from werkzeug.security import check_password_hash
 from flask_jwt_extended import (
     create_access_token,
     set_access_cookies,
     jwt_required,
-    get_jwt_identity,
+    get_jwt,
+    verify_jwt_in_request,
     unset_jwt_cookies
 )
-from functools import wraps
 from models.db import get_db_connection
+from utils.identity import current_user
+from utils.auth import admin_required  # re-exported for route modules
+from utils.revocation import revoke
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
@@ -27,7 +30,7 @@ def login():
 
     conn = get_db_connection()
     user = conn.execute(
-        "SELECT id, email, password, role FROM users WHERE email = ?",
+        "SELECT id, email, password, role, auth_version FROM users WHERE email = ?",
         (email,)
     ).fetchone()
     conn.close()
@@ -38,7 +41,7 @@ def login():
     # ✅ Create JWT with role included
     access_token = create_access_token(
         identity=str(user["id"]),
-        additional_claims={"role": user["role"]}
+        additional_claims={"role": user["role"], "auth_version": user["auth_version"]}
     )
 
     # ✅ Role-aware redirect (THIS FIXES YOUR ISSUE)
@@ -58,14 +61,7 @@ def login():
 @auth_bp.get("/me")
 @jwt_required()
 def get_me():
-    user_id = int(get_jwt_identity())
-
-    conn = get_db_connection()
-    user = conn.execute(
-        "SELECT id, email, role, created_at FROM users WHERE id = ?",
-        (user_id,)
-    ).fetchone()
-    conn.close()
+    user = current_user()
 
     if not user:
         return jsonify({"error": "user not found"}), 404
@@ -83,31 +79,16 @@ def get_me():
 # ---------------------------
 @auth_bp.post("/logout")
 def logout():
+    # Revoke the token itself, not just the cookie: a copy of it stops working too
+    try:
+        verify_jwt_in_request(optional=True)
+        jwt_data = get_jwt()
+    except Exception:
+        jwt_data = {}  # expired or already invalid: nothing to revoke
+
+    if jwt_data:
+        revoke(jwt_data["jti"], jwt_data["exp"], int(jwt_data["sub"]))
+
     resp = make_response(redirect("/login"))
     unset_jwt_cookies(resp)
     return resp
-
-
-# ---------------------------
-# Admin Guard
-# ---------------------------
-def admin_required(fn):
-    @wraps(fn)
-    def wrapper(*args, **kwargs):
-        user_id = get_jwt_identity()
-
-        if not user_id:
-            abort(401)
-
-        conn = get_db_connection()
-        user = conn.execute(
-            "SELECT role FROM users WHERE id = ?",
-            (int(user_id),)
-        ).fetchone()
-        conn.close()
-
-        if not user or user["role"] != "admin":
-            abort(403)
-
-        return fn(*args, **kwargs)
-    return wrapper
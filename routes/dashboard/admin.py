@@ -1,110 +1,278 @@
-from flask import render_template, jsonify, redirect, url_for, abort, request
+from flask import render_template, jsonify, redirect, url_for, abort, request, Response, stream_with_context, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from . import dashboard_bp
 from routes.auth import admin_required
 from models.db import get_db_connection
 from rules.request_rules import VALID_CATEGORIES
-from routes.dashboard.user import _get_user_and_role
+from routes.dashboard.user import _get_user_and_role, _requests_per_page
+from utils.pagination import encode_cursor, decode_cursor
+from models.fts import fts_query
+from models.request_filters import (
+    FilterError,
+    parse_filters,
+    parse_sort,
+    order_by_sql,
+    keyset_sql,
+    next_cursor,
+)
 from models.db import get_db_connection
-from rules.sla_rules import compute_sla_status
+from rules.sla_rules import compute_sla_statuses, count_by_sla
+from models.counters import read_counters, read_counter, count
+from models.analytics import parse_analytics_filters, rollup_report, latency_report, selected_ts_range
+from models.request_events import stage_durations
+from datetime import datetime, timezone
+import csv
+import io
+import json
+import time
 
 
 
 
 # - - - - - - - - - - - - - - 
 # Admin metrics
+QUEUE_STATUSES = ("pending", "in_progress")
+QUEUE_SIZE = 50
+
+# Columns of a dashboard queue row (partials/admin_queue_row.html)
+QUEUE_ROW_SQL = """
+    SELECT
+        r.id,
+        u.email AS employee,
+        r.request_type,
+        r.category,
+        r.priority,
+        r.department,
+        r.status,
+        r.admin_review_notes,
+        (CAST(strftime('%s', 'now') AS INTEGER) - r.created_ts) / 86400 AS age_days,
+        r.created_at,
+        r.created_ts,
+        r.due_ts
+    FROM requests r
+    JOIN users u ON u.id = r.user_id
+"""
+
+
+def _queue_counters(conn):
+    """
+    KPI card values, all O(1) or index-only reads. Also returns the raw
+    counters for callers that need more.
+    """
+    # O(1) reads from request_counters (trigger-maintained) instead of scans
+    counters = read_counters(conn, "status", "approval", "active_category")
+
+    # FIXED: Count both pending AND in_progress
+    action_required_count = (
+        count(counters, "status", "pending") + count(counters, "status", "in_progress")
+    )
+
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    new_today, _ = read_counter(conn, "day", today)
+
+    # Avg approval time: pending -> approved/in_progress, from request_events
+    approved, approval_seconds = counters["approval"].get("all", (0, 0))
+    avg_hours = approval_seconds / 3600 / approved if approved else None
+
+    # SLA counts over every active request, aggregated in SQL
+    sla_counts = count_by_sla(conn)
+
+    return {
+        "action_required_count": action_required_count,
+        "new_today": new_today,
+        "avg_hours": avg_hours,
+        "sla_overdue_count": sla_counts["overdue"],
+        "sla_at_risk_count": sla_counts["at_risk"],
+    }, counters
+
+
 def _admin_metrics():
     conn = get_db_connection()
     cur = conn.cursor()
 
-    # --- Metrics ---
-    # FIXED: Count both pending AND in_progress
-    cur.execute("SELECT COUNT(*) AS c FROM requests WHERE status IN ('pending', 'in_progress')")
-    action_required_count = cur.fetchone()["c"]
-
-    cur.execute("SELECT COUNT(*) AS c FROM requests WHERE DATE(created_at) = DATE('now')")
-    new_today = cur.fetchone()["c"]
+    # Read before the rows: the live feed resumes after this id, so a
+    # change that lands in between is sent rather than lost
+    live_after = _last_event_id(conn)
 
-    # Avg completion time (completed requests only)
-    cur.execute("""
-        SELECT AVG((julianday(reviewed_at) - julianday(created_at)) * 24.0) AS avg_hours
-        FROM requests
-        WHERE status = 'completed' AND reviewed_at IS NOT NULL
-    """)
-    avg_hours = cur.fetchone()["avg_hours"]
+    # --- Metrics ---
+    metrics, counters = _queue_counters(conn)
 
     # --- SINGLE DATASET FOR DASHBOARD TABLE ---
-    cur.execute("""
-        SELECT
-            r.id,
-            u.email AS employee,
-            r.request_type,
-            r.category,
-            r.priority,
-            r.department,
-            r.status,
-            r.admin_review_notes,
-            CAST((julianday('now') - julianday(r.created_at)) AS INT) AS age_days,
-            r.created_at
-        FROM requests r
-        JOIN users u ON u.id = r.user_id
-        WHERE r.status IN ('pending', 'in_progress')
-        ORDER BY
-            CASE r.status
-                WHEN 'pending' THEN 1
-                WHEN 'in_progress' THEN 2
-                ELSE 3
-            END,
-            r.created_at DESC
-        LIMIT 50
-    """)
-    requests = cur.fetchall()
-
-    sla_overdue_count = 0
-    sla_at_risk_count = 0
-
-    for r in requests:
-        sla = compute_sla_status(r)
-        if not sla:
-            continue
-        
-        if sla == "overdue":
-            sla_overdue_count += 1
-        elif sla == "at_risk":
-            sla_at_risk_count += 1
+    # Most urgent first: soonest stored SLA deadline, no deadline last.
+    # One (status, due_ts) index walk per status, merged; NULL deadlines
+    # come first in the index, so fetch past them and move them last.
+    no_deadline = cur.execute("""
+        SELECT COUNT(*) FROM requests
+        WHERE status IN ('pending', 'in_progress') AND due_ts IS NULL
+    """).fetchone()[0]
+    arms = " UNION ALL ".join(
+        QUEUE_ROW_SQL + f" WHERE r.status = '{status}'" for status in QUEUE_STATUSES
+    )
+    cur.execute(arms + " ORDER BY r.due_ts, r.id LIMIT ?", (QUEUE_SIZE + no_deadline,))
+    requests = sorted(cur.fetchall(), key=lambda r: r["due_ts"] is None)[:QUEUE_SIZE]
 
-    
     # --- Insight (based on pending + in_progress) ---
-    cur.execute("""
-        SELECT category,
-               AVG(julianday('now') - julianday(created_at)) AS avg_pending_days
-        FROM requests
-        WHERE status IN ('pending', 'in_progress')
-        GROUP BY category
-        ORDER BY avg_pending_days DESC
-        LIMIT 1
-    """)
-    slowest = cur.fetchone()
+    # Longest average wait = oldest average created_ts among active requests
+    slowest = None
+    oldest_avg_created = None
+    for category, (active, created_ts_sum) in counters["active_category"].items():
+        if active <= 0:
+            continue
+        avg_created = created_ts_sum / active
+        if oldest_avg_created is None or avg_created < oldest_avg_created:
+            slowest, oldest_avg_created = category, avg_created
 
     conn.close()
 
-    if slowest and slowest["category"] and slowest["avg_pending_days"] is not None:
-        insight = f"{slowest['category']} requests are waiting the longest on average right now."
+    if slowest:
+        insight = f"{slowest} requests are waiting the longest on average right now."
     else:
         insight = "Queue looks healthy. No category is significantly delayed."
 
     return {
-        "action_required_count": action_required_count,
-        "new_today": new_today,
-        "avg_hours": avg_hours,
+        **metrics,
         "requests": requests,
         "insight": insight,
-        "sla_overdue_count": sla_overdue_count,
-        "sla_at_risk_count": sla_at_risk_count,
+        "live_after": live_after,
     }
 
 
+# - - - - - - - - - - - - - -
+# Admin live feed (Server-Sent Events)
+# How often the stream checks PRAGMA data_version for other connections' commits
+LIVE_POLL_SECONDS = 1.0
+# Comment line sent when idle, so proxies keep the connection open; also a
+# fallback check for commits data_version cannot see (this thread's own)
+LIVE_HEARTBEAT_SECONDS = 15
+# Streams end after this long (app.config["ADMIN_LIVE_MAX_SECONDS"] overrides);
+# EventSource reconnects with Last-Event-ID, which re-checks the admin's
+# token and frees the worker thread
+LIVE_MAX_SECONDS = 300
+LIVE_BATCH = 200
+
+
+def _sse(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _live_events(conn, after_id):
+    """
+    SSE messages for up to LIVE_BATCH request_events after after_id,
+    oldest first. Returns (messages, last id); a full batch means more
+    may be waiting.
+    """
+    events = conn.execute(
+        """
+        SELECT id, request_id, from_status, to_status
+        FROM request_events
+        WHERE id > ?
+        ORDER BY id
+        LIMIT ?
+        """,
+        (after_id, LIVE_BATCH)
+    ).fetchall()
+    if not events:
+        return [], after_id
+
+    # Current row of every request still in the queue, rendered like the page
+    ids = sorted({e["request_id"] for e in events})
+    rows = {
+        row["id"]: row
+        for row in conn.execute(
+            QUEUE_ROW_SQL + f" WHERE r.id IN ({', '.join('?' for _ in ids)})",
+            ids
+        )
+    }
+
+    messages = []
+    for e in events:
+        row = rows.get(e["request_id"])
+        data = {
+            "id": e["request_id"],
+            "kind": "created" if e["from_status"] is None and e["to_status"] == "pending" else "status",
+            "from": e["from_status"],
+            "to": e["to_status"],
+        }
+        if row is not None and row["status"] in QUEUE_STATUSES:
+            data["html"] = render_template("partials/admin_queue_row.html", r=row)
+        messages.append(_sse("request", data, e["id"]))
+
+    return messages, events[-1]["id"]
+
+
+def _last_event_id(conn):
+    return conn.execute("SELECT COALESCE(MAX(id), 0) FROM request_events").fetchone()[0]
+
+
+@dashboard_bp.get("/admin/live")
+@jwt_required()
+@admin_required
+def admin_live_feed():
+    """
+    Server-Sent Events for the admin dashboard: a "request" message per
+    request_events row (creation or status change, with the queue row
+    re-rendered when the request is still queued) and a "counters"
+    message with the KPI values once caught up. Starts from the
+    Last-Event-ID header (EventSource sends it on reconnect), else ?after=
+    (the dashboard renders the last event id its rows reflect), else from
+    now.
+
+    Each open stream holds one worker thread, so serve the app with
+    threaded workers.
+    """
+    after = request.headers.get("Last-Event-ID") or request.args.get("after")
+    conn = get_db_connection()
+    try:
+        last_id = int(after)
+    except (TypeError, ValueError):
+        last_id = _last_event_id(conn)
+
+    max_seconds = current_app.config.get("ADMIN_LIVE_MAX_SECONDS") or LIVE_MAX_SECONDS
+
+    def stream():
+        nonlocal last_id
+        started = time.monotonic()
+        checked = float("-inf")
+        seen_version = None
+
+        yield "retry: 3000\n\n"
+        while time.monotonic() - started < max_seconds:
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            now = time.monotonic()
+
+            if version != seen_version or now - checked >= LIVE_HEARTBEAT_SECONDS:
+                # Drain the backlog a batch at a time before marking this
+                # version seen; a full batch means more are waiting
+                sent = False
+                while True:
+                    messages, last_id = _live_events(conn, last_id)
+                    for message in messages:
+                        yield message
+                    sent = sent or bool(messages)
+                    if len(messages) < LIVE_BATCH:
+                        break
+
+                if sent:
+                    metrics, _ = _queue_counters(conn)
+                    yield _sse("counters", metrics)
+                elif seen_version is not None:
+                    yield ": ping\n\n"
+                seen_version, checked = version, now
+
+            time.sleep(LIVE_POLL_SECONDS)
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
 # - - - - - - - - - - - - - - 
 # Admin Dashboard
@@ -161,54 +329,42 @@ def admin_analytics():
     user_id = get_jwt_identity()
     user = _get_user_and_role(int(user_id))
 
+    try:
+        where, params, selected = parse_analytics_filters(request.args)
+    except FilterError as e:
+        abort(400, str(e))
+
     conn = get_db_connection()
 
-    metrics = conn.execute("""
-        SELECT
-            COUNT(*) AS total_requests,
-            SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) AS pending_requests,
-            SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) AS completed_requests
-        FROM requests
-    """).fetchone()
-
-    # Category stats
-    category_stats = conn.execute("""
-        SELECT
-            category,
-            COUNT(*) AS total,
-            SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) AS completed
-        FROM requests
-        GROUP BY category
-        ORDER BY total DESC
-    """).fetchall()
+    # Range and filter stats from the daily rollups (no table scan)
+    report = rollup_report(conn, where, params)
+    by_status = report["by_status"]
 
-    # Active requests for SLA calculation
-    active_requests = conn.execute("""
-        SELECT
-            id,
-            priority,
-            status,
-            created_at
-        FROM requests
-        WHERE status IN ('pending', 'in_progress')
-    """).fetchall()
+    # p50/p90/p99 from the merged per-day latency sketches
+    latency = {
+        metric: latency_report(conn, selected, metric)
+        for metric in ("approval", "completion")
+    }
 
-    conn.close()
+    # Time spent in each status, from the request_events log
+    stages = stage_durations(conn, *selected_ts_range(selected))
 
-    # --- SLA analytics ---
-    sla_overdue_count = 0
-    sla_at_risk_count = 0
-    total_active = len(active_requests)
+    metrics = {
+        "total_requests": report["totals"]["total"],
+        "pending_requests": by_status.get("pending", 0),
+        "completed_requests": by_status.get("completed", 0),
+        "avg_completion_hours": report["totals"]["avg_completion_hours"],
+        "sla_met_rate": report["totals"]["sla_met_rate"],
+    }
 
-    for r in active_requests:
-        sla = compute_sla_status(r)
-        if not sla:
-            continue
+    # --- SLA analytics (current open requests, aggregated in SQL) ---
+    sla_counts = count_by_sla(conn)
 
-        if sla == "overdue":
-            sla_overdue_count += 1
-        elif sla == "at risk":
-            sla_at_risk_count += 1
+    conn.close()
+
+    sla_overdue_count = sla_counts["overdue"]
+    sla_at_risk_count = sla_counts["at_risk"]
+    total_active = sum(sla_counts.values())
 
     # Calculate SLA compliance rate
     sla_on_track = total_active - sla_overdue_count - sla_at_risk_count
@@ -218,7 +374,14 @@ def admin_analytics():
         "admin_analytics.html",
         user=user,
         metrics=metrics,
-        category_stats=category_stats,
+        category_stats=report["by_category"],
+        department_stats=report["by_department"],
+        daily=report["daily"],
+        latency=latency,
+        stages=stages,
+        selected=selected,
+        departments=["corporate", "healthcare", "legal"],
+        categories=sorted(VALID_CATEGORIES),
         sla_overdue_count=sla_overdue_count,
         sla_at_risk_count=sla_at_risk_count,
         sla_compliance_rate=sla_compliance_rate
@@ -232,11 +395,16 @@ def admin_analytics():
 @admin_required
 def admin_analytics_post():
     """
-    Placeholder POST route.
-    Analytics is currently read-only.
-    Future use: filters (date range, department, category).
+    Applies the analytics filter form (date range, department, category,
+    priority, status) by redirecting to the GET view with them as query
+    parameters, so filtered views can be bookmarked and reloaded.
     """
-    return redirect(url_for("dashboard.admin_analytics"))
+    try:
+        _, _, selected = parse_analytics_filters(request.form)
+    except FilterError as e:
+        abort(400, str(e))
+
+    return redirect(url_for("dashboard.admin_analytics", **selected))
 
 
 
@@ -280,19 +448,57 @@ def admin_integrations():
     )
 
 
+# - - - - - - - - - - - - - - 
+# Export permissions
+def _export_permissions(cur, user_id):
+    """
+    (can_export, csv_export_enabled) from user_integrations.
+    A user without a row gets the column defaults (both on).
+    """
+    row = cur.execute(
+        "SELECT can_export, csv_export_enabled FROM user_integrations WHERE user_id = ?",
+        (user_id,)
+    ).fetchone()
+
+    if row is None:
+        return True, True
+    return bool(row["can_export"]), bool(row["csv_export_enabled"])
+
+
 #- - - - - - - - - - - - - - - - -
 # Admin Requests route
 @dashboard_bp.get("/admin/requests")
 @jwt_required()
 @admin_required
 def admin_requests():
+    """
+    One page of requests, filtered and sorted from query params
+    (see models.request_filters), with keyset pagination via ?cursor=.
+    """
     admin_id = int(get_jwt_identity())
     admin = _get_user_and_role(admin_id)
 
-    # --- Read filter from query params ---
-    selected_status = request.args.get("status", "all")
+    now = time.time()
+
+    try:
+        where, params, selected = parse_filters(request.args, now)
+        sort, direction = parse_sort(request.args)
+        page_where = list(where)
+        page_params = list(params)
+
+        cursor = request.args.get("cursor")
+        if cursor:
+            keyset, keyset_params = keyset_sql(sort, direction, cursor)
+            page_where.append(keyset)
+            page_params += keyset_params
+    except FilterError as e:
+        abort(400, str(e))
 
     conn = get_db_connection()
+    cur = conn.cursor()
+
+    page_size = _requests_per_page(admin_id)
+    can_export, csv_export_enabled = _export_permissions(cur, admin_id)
 
     sql = """
         SELECT
@@ -303,43 +509,275 @@ def admin_requests():
             r.department,
             r.status,
             r.created_at,
+            r.created_ts,
+            r.due_ts,
+            r.reviewed_at,
             r.admin_review_notes,
             u.email AS employee,
             reviewer.email AS reviewed_by_email,
-            CAST((julianday('now') - julianday(r.created_at)) AS INT) AS age_days
+            (CAST(strftime('%s', 'now') AS INTEGER) - r.created_ts) / 86400 AS age_days,
+            (r.due_ts - CAST(strftime('%s', 'now') AS INTEGER)) / 3600 AS hours_left
         FROM requests r
         JOIN users u ON u.id = r.user_id
         LEFT JOIN users reviewer ON reviewer.id = r.reviewed_by
     """
 
-    params = []
-
-    if selected_status != "all":
-        sql += " WHERE r.status = ?"
-        params.append(selected_status)
-
-    sql += " ORDER BY r.created_at DESC"
+    if page_where:
+        sql += " WHERE " + " AND ".join(page_where)
+        if "sla" in selected or "due_within" in selected:
+            # A due_ts range over two statuses has no index in any sort order
+            sql += " /* temp-sort: deadline filters match open requests only; the sorter keeps LIMIT rows */"
+    else:
+        # Every SORT_COLUMNS order has a (column, id) index (see
+        # migrations/0019_requests_sort_indexes.py), so the walk stops at LIMIT
+        sql += " /* full-scan: unfiltered listing walks the sort index, bounded by LIMIT */"
+
+    # One extra row tells us whether there is a next page
+    sql += f" ORDER BY {order_by_sql(sort, direction)} LIMIT ?"
+    rows = cur.execute(sql, (*page_params, page_size + 1)).fetchall()
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    # Total for the filters (not the page): counters when possible
+    if set(selected) <= {"status"}:
+        counters = read_counters(conn, "status")
+        if "status" in selected:
+            total_count = count(counters, "status", selected["status"])
+        else:
+            total_count = sum(c for c, _ in counters["status"].values())
+    else:
+        count_sql = """
+            SELECT COUNT(*) AS c
+            FROM requests r
+            JOIN users u ON u.id = r.user_id
+            WHERE """ + " AND ".join(where)
+        total_count = cur.execute(count_sql, params).fetchone()["c"]
 
-    requests = conn.execute(sql, params).fetchall()
     conn.close()
 
     requests_with_sla = []
 
-    for r in requests:
-        sla = compute_sla_status(r)
+    for r, sla in zip(rows, compute_sla_statuses(rows, now)):
         r_dict = dict(r)
         r_dict["sla"] = sla
         requests_with_sla.append(r_dict)
 
-
     categories = sorted(VALID_CATEGORIES)
 
+    # Query string for links that keep the current filters
+    filter_args = {**selected, "sort": sort, "dir": direction}
+
     return render_template(
         "admin_requests.html",
         user=admin,
         requests=requests_with_sla, 
         categories=categories,
-        selected_status=selected_status
+        selected=selected,
+        selected_status=selected.get("status", "all"),
+        sort=sort,
+        direction=direction,
+        filter_args=filter_args,
+        total_count=total_count,
+        next_cursor=next_cursor(rows[-1], sort) if has_more else None,
+        is_first_page=not cursor,
+        can_export_csv=can_export and csv_export_enabled
+    )
+
+
+#- - - - - - - - - - - - - - - - -
+# Admin Requests search (ranked)
+# bm25 column weights: request_type, admin_review_notes, employee
+SEARCH_BM25_WEIGHTS = (4.0, 2.0, 3.0)
+
+
+@dashboard_bp.get("/admin/requests/search")
+@jwt_required()
+@admin_required
+def search_admin_requests():
+    """
+    Requests matching ?q= (request type, review notes, requester email),
+    best match first, narrowed by the admin requests filters. Keyset
+    pagination on (score, id) via ?cursor=; ?limit= can only lower the
+    admin's page size.
+    """
+    admin_id = int(get_jwt_identity())
+
+    match = fts_query(request.args.get("q"))
+    if match is None:
+        return jsonify({"error": "q is required"}), 400
+
+    # Text matching is done by the ranked join below, not the filter form of q
+    filter_args = {k: v for k, v in request.args.items() if k != "q"}
+    try:
+        where, params, selected = parse_filters(filter_args)
+    except FilterError as e:
+        return jsonify({"error": str(e)}), 400
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        values = decode_cursor(cursor, ((int, float), int))
+        if values is None:
+            return jsonify({"error": "invalid cursor"}), 400
+        where.append("(m.score, r.id) > (?, ?)")
+        params += values
+
+    page_size = _requests_per_page(admin_id)
+    try:
+        page_size = max(1, min(int(request.args.get("limit", page_size)), page_size))
+    except ValueError:
+        return jsonify({"error": "limit must be a number"}), 400
+
+    weights = ", ".join(str(w) for w in SEARCH_BM25_WEIGHTS)
+    sql = f"""
+        WITH m AS (
+            SELECT rowid AS id, bm25(requests_fts, {weights}) AS score
+            FROM requests_fts
+            WHERE requests_fts MATCH ?
+        )
+        SELECT
+            r.id,
+            r.request_type,
+            r.category,
+            r.priority,
+            r.department,
+            r.status,
+            r.created_at,
+            r.admin_review_notes,
+            u.email AS employee,
+            m.score
+        FROM m
+        JOIN requests r ON r.id = m.id
+        JOIN users u ON u.id = r.user_id
+    """
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " /* temp-sort: ranks the FTS matches by bm25 */ ORDER BY m.score, r.id LIMIT ?"
+
+    conn = get_db_connection()
+    rows = conn.execute(sql, (match, *params, page_size + 1)).fetchall()
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    return jsonify({
+        "requests": [dict(r) for r in rows],
+        "next_cursor": encode_cursor(rows[-1]["score"], rows[-1]["id"]) if has_more else None,
+        "page_size": page_size,
+    })
+
+
+#- - - - - - - - - - - - - - - - -
+# Admin Requests export
+EXPORT_COLUMNS = [
+    "id",
+    "employee",
+    "request_type",
+    "category",
+    "priority",
+    "department",
+    "status",
+    "created_at",
+    "reviewed_at",
+    "reviewed_by_email",
+    "admin_review_notes",
+]
+
+EXPORT_FETCH_SIZE = 1000
+
+
+@dashboard_bp.get("/admin/requests/export")
+@jwt_required()
+@admin_required
+def export_admin_requests():
+    """
+    Streams every request matching the admin requests filters as CSV
+    (?format=csv, default) or NDJSON (?format=ndjson): in id order when
+    unfiltered, else in the order of the index serving the filters.
+    Rows are fetched in batches and never sorted, so memory stays flat
+    however many match.
+    """
+    admin_id = int(get_jwt_identity())
+
+    fmt = request.args.get("format", "csv")
+    if fmt not in ("csv", "ndjson"):
+        abort(400, "format must be csv or ndjson")
+
+    try:
+        where, params, selected = parse_filters(request.args)
+    except FilterError as e:
+        abort(400, str(e))
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    can_export, csv_export_enabled = _export_permissions(cur, admin_id)
+    if not can_export or (fmt == "csv" and not csv_export_enabled):
+        abort(403)
+
+    sql = """
+        SELECT
+            r.id,
+            u.email AS employee,
+            r.request_type,
+            r.category,
+            r.priority,
+            r.department,
+            r.status,
+            r.created_at,
+            r.reviewed_at,
+            reviewer.email AS reviewed_by_email,
+            r.admin_review_notes
+        FROM requests r
+        JOIN users u ON u.id = r.user_id
+        LEFT JOIN users reviewer ON reviewer.id = r.reviewed_by
+    """
+    if where:
+        # No ORDER BY: rows stream in the order the filter's index yields
+        # them; sorting by id would buffer every match before the first row
+        sql += " WHERE " + " AND ".join(where)
+    else:
+        # Walks the primary key, so id order costs nothing
+        sql += " /* full-scan: export of every request */ ORDER BY r.id"
+
+    def generate():
+        rows = cur.execute(sql, params)
+        try:
+            if fmt == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(EXPORT_COLUMNS)
+                while True:
+                    batch = rows.fetchmany(EXPORT_FETCH_SIZE)
+                    if not batch:
+                        break
+                    writer.writerows([r[c] for c in EXPORT_COLUMNS] for r in batch)
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                if buffer.tell():
+                    yield buffer.getvalue()
+            else:
+                while True:
+                    batch = rows.fetchmany(EXPORT_FETCH_SIZE)
+                    if not batch:
+                        break
+                    yield "".join(
+                        json.dumps({c: r[c] for c in EXPORT_COLUMNS}) + "\n"
+                        for r in batch
+                    )
+        finally:
+            conn.close()
+
+    stamp = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f"attachment; filename=requests_export_{stamp}.{fmt}",
+        },
     )
 
 
@@ -1,12 +1,14 @@
-from flask import render_template, redirect, url_for, jsonify, abort, request
+from flask import render_template, redirect, url_for, jsonify, abort, request, make_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from . import dashboard_bp
 from models.db import get_db_connection
-from rules.request_rules import VALID_CATEGORIES
+from rules.request_rules import VALID_CATEGORIES, VALID_STATUSES, VALID_PRIORITIES
+from utils.pagination import encode_cursor, decode_cursor
+from utils.identity import current_user, current_prefs, forget_identity
+from models.kb import get_article, article_html, content_hash, kb_categories, search_articles
 from flask import render_template, abort
-import markdown
-from rules.sla_rules import compute_sla_status, did_meet_sla
+from rules.sla_rules import compute_sla_statuses, did_meet_sla, sla_boundaries_passed
 
 
 
@@ -15,25 +17,8 @@ from rules.sla_rules import compute_sla_status, did_meet_sla
 
 # User helper
 def _get_user_and_role(user_id: int):
-    conn = get_db_connection()
-    cur = conn.cursor()
-    
-    cur.execute("""
-        SELECT
-        id,
-        email,
-        role,
-        full_name,
-        department,
-        avatar_url,
-        created_at
-    FROM users
-    WHERE id = ?
-""", (user_id,))
-
-    user = cur.fetchone()
-    conn.close()
-    return user
+    # Shared with the context processor and auth decorators (one query per request)
+    return current_user(user_id)
 
 
 # - - - - - - - - - - - - - - 
@@ -125,7 +110,7 @@ def user_profile():
             AVG(
                 CASE
                     WHEN status = 'completed'
-                    THEN julianday(reviewed_at) - julianday(created_at)
+                    THEN (reviewed_ts - created_ts) / 86400.0
                     ELSE NULL
                 END
             ) AS avg_completion_days
@@ -136,6 +121,7 @@ def user_profile():
 
     # --- Most common category ---
     cur.execute("""
+        /* temp-sort: groups and ranks one user's requests by category */
         SELECT category
         FROM requests
         WHERE user_id = ?
@@ -219,30 +205,21 @@ def user_preferences():
     user_id = int(get_jwt_identity())
     user = _get_user_and_role(user_id)
 
-    conn = get_db_connection()
-    cur = conn.cursor()
-
-    # Fetch preferences
-    cur.execute(
-        "SELECT * FROM user_preferences WHERE user_id = ?",
-        (user_id,)
-    )
-    prefs = cur.fetchone()
+    # Preferences came with the identity query
+    prefs = current_prefs(user_id)
 
     # Lazy-create defaults if missing
     if not prefs:
-        cur.execute(
+        conn = get_db_connection()
+        conn.execute(
             "INSERT INTO user_preferences (user_id) VALUES (?)",
             (user_id,)
         )
         conn.commit()
-        cur.execute(
-            "SELECT * FROM user_preferences WHERE user_id = ?",
-            (user_id,)
-        )
-        prefs = cur.fetchone()
+        conn.close()
 
-    conn.close()
+        forget_identity(user_id)
+        prefs = current_prefs(user_id)
 
     return render_template(
         "user_settings.html",
@@ -338,39 +315,67 @@ def user_knowledge_base():
 @dashboard_bp.get("/user/knowledge-base/article/<slug>")
 @jwt_required()
 def kb_article_detail(slug):
-    import markdown
-
     user_id = int(get_jwt_identity())
-    user = _get_user_and_role(user_id)
-
-    db = get_db_connection()
-    cur = db.cursor()
 
-    article = cur.execute(
-        """
-        SELECT title, category, summary, content, created_at
-        FROM kb_articles
-        WHERE slug = ?
-        """,
-        (slug,)
-    ).fetchone()
+    conn = get_db_connection()
+    article = get_article(conn, slug)
 
     if not article:
         abort(404)
 
-    # ✅ RENDER MARKDOWN → HTML
-    html_content = markdown.markdown(
-        article["content"],
-        extensions=["fenced_code", "tables"]
-    )
+    # The page is per user (sidebar, theme), so the ETag covers both
+    user = _get_user_and_role(user_id)
+    prefs = current_prefs(user_id)
+    viewer = content_hash(repr((sorted(user.items()), prefs and prefs["theme"])))
+    etag = f"{article['content_hash']}-{viewer[:12]}"
 
-    return render_template(
-        "kb_article_detail.html",
-        user=user,
-        article=article,
-        article_html=html_content,
-        active_page="knowledge_base"
-    )
+    if request.if_none_match.contains_weak(etag):
+        resp = make_response("", 304)
+    else:
+        resp = make_response(render_template(
+            "kb_article_detail.html",
+            user=user,
+            article=article,
+            article_html=article_html(conn, article),
+            active_page="knowledge_base"
+        ))
+
+    resp.set_etag(etag, weak=True)
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True
+    return resp
+
+
+# Knowledge base search (FTS5)
+KB_SEARCH_MAX_RESULTS = 50
+
+
+@dashboard_bp.get("/api/kb/search")
+@jwt_required()
+def kb_search_api():
+    """
+    ?q= free text (last word matches as a prefix), ?category= filter,
+    ?limit=. Returns ranked results with highlighted snippets and
+    per-category match counts.
+    """
+    text = request.args.get("q", "")
+    category = request.args.get("category") or None
+
+    try:
+        limit = min(int(request.args.get("limit", 20)), KB_SEARCH_MAX_RESULTS)
+    except ValueError:
+        return jsonify({"error": "limit must be a number"}), 400
+
+    conn = get_db_connection()
+    if category and category not in kb_categories(conn):
+        return jsonify({"error": "invalid category"}), 400
+
+    results, facets = search_articles(conn, text, category, max(limit, 1))
+
+    for r in results:
+        r["url"] = url_for("dashboard.kb_article_detail", slug=r["slug"])
+
+    return jsonify({"query": text, "results": results, "facets": facets})
 
 
 # User Integrations Route
@@ -407,15 +412,97 @@ def open_teams():
 # - - - - - - - - - - - - - -
 # API Route 'My Requests'
 # - - - - - - - - - - - - - -
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+def _requests_per_page(user_id):
+    prefs = current_prefs(user_id)
+    per_page = prefs["requests_per_page"] if prefs and prefs["requests_per_page"] else DEFAULT_PAGE_SIZE
+    return max(1, min(per_page, MAX_PAGE_SIZE))
+
+
+def _user_requests_etag(conn, user_id, page_size):
+    """
+    Strong ETag for the user's requests API, from request_watermarks and
+    the SLA boundaries the user's open requests have passed. Changes
+    whenever any response body for this user (at this page size) could.
+    """
+    row = conn.execute(
+        "SELECT seq FROM request_watermarks WHERE user_id = ?",
+        (user_id,)
+    ).fetchone()
+    seq = row["seq"] if row else 0
+
+    passed = sla_boundaries_passed(conn, user_id)
+    return f"u{user_id}-{seq}-{passed}-{page_size}"
+
+
+def _with_etag(resp, etag):
+    # no-cache: browsers keep the body but revalidate on every fetch
+    resp.set_etag(etag)
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True
+    return resp
+
+
 @dashboard_bp.get("/api/user/requests")
 @jwt_required()
 def user_requests_api():
-    user_id = get_jwt_identity()
+    """
+    One page of the user's requests, newest first.
+
+    Query params: status, priority, category (filters), limit (at most the
+    user's requests_per_page), cursor (next_cursor from the previous page).
+    Keyset pagination on (created_at, id) over idx_requests_user_created.
+
+    Sends a strong ETag from the user's change watermark; a matching
+    If-None-Match gets a 304 before the page is queried. There is no
+    Last-Modified: one-second dates cannot tell apart changes made in
+    the same second as the previous response.
+    """
+    user_id = int(get_jwt_identity())
+
+    filters = {
+        "status": (request.args.get("status"), VALID_STATUSES),
+        "priority": (request.args.get("priority"), VALID_PRIORITIES),
+        "category": (request.args.get("category"), VALID_CATEGORIES),
+    }
+
+    where = ["user_id = ?"]
+    params = [user_id]
+
+    for column, (value, allowed) in filters.items():
+        if not value:
+            continue
+        if value not in allowed:
+            return jsonify({"error": f"invalid {column}"}), 400
+        where.append(f"{column} = ?")
+        params.append(value)
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        after = decode_cursor(cursor, (str, int))
+        if after is None:
+            return jsonify({"error": "invalid cursor"}), 400
+        where.append("(created_at, id) < (?, ?)")
+        params += after
 
     conn = get_db_connection()
     cur = conn.cursor()
 
-    cur.execute("""
+    page_size = _requests_per_page(user_id)
+    limit = request.args.get("limit", type=int)
+    if limit:
+        page_size = max(1, min(limit, page_size))
+
+    etag = _user_requests_etag(conn, user_id, page_size)
+    if request.if_none_match.contains(etag):
+        conn.close()
+        return _with_etag(make_response("", 304), etag)
+
+    # Fetch one extra row to know whether another page exists
+    cur.execute(f"""
         SELECT
             id,
             request_type,
@@ -424,21 +511,25 @@ def user_requests_api():
             priority,
             status,
             created_at,
+            created_ts,
+            due_ts,
             reviewed_at,
             admin_review_notes
         FROM requests
-        WHERE user_id = ?
-        ORDER BY created_at DESC
-    """, (int(user_id),))
+        WHERE {" AND ".join(where)}
+        ORDER BY created_at DESC, id DESC
+        LIMIT ?
+    """, (*params, page_size + 1))
 
     rows = cur.fetchall()
     conn.close()
 
-    results = []
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
 
-    for row in rows:
-        sla = compute_sla_status(row)
+    results = []
 
+    for row, sla in zip(rows, compute_sla_statuses(rows)):
         results.append({
             "id": row["id"],
             "request_type": row["request_type"],
@@ -452,7 +543,45 @@ def user_requests_api():
             "sla": sla   
         })
 
-    return jsonify(results)
+    next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"]) if has_more else None
+
+    resp = jsonify({
+        "requests": results,
+        "next_cursor": next_cursor,
+        "page_size": page_size
+    })
+    return _with_etag(resp, etag)
+
+
+# Dashboard cards (aggregated server-side so the page needn't load every request)
+@dashboard_bp.get("/api/user/requests/summary")
+@jwt_required()
+def user_requests_summary_api():
+    user_id = int(get_jwt_identity())
+
+    conn = get_db_connection()
+    row = conn.execute("""
+        SELECT
+            COALESCE(SUM(status = 'pending'), 0) AS open_items,
+            COALESCE(SUM(
+                status IN ('approved', 'completed', 'denied')
+                AND created_ts >= CAST(strftime('%s', 'now', '-30 days') AS INTEGER)
+            ), 0) AS completed_recently,
+            COALESCE(SUM(
+                created_ts >= CAST(strftime('%s', 'now', '-7 days') AS INTEGER)
+            ), 0) AS this_week,
+            AVG(
+                CASE
+                    WHEN status IN ('approved', 'completed', 'denied') AND reviewed_ts IS NOT NULL
+                    THEN (reviewed_ts - created_ts) / 86400.0
+                END
+            ) AS avg_processing_days
+        FROM requests
+        WHERE user_id = ?
+    """, (user_id,)).fetchone()
+    conn.close()
+
+    return jsonify(dict(row))
 
 
 @dashboard_bp.get("/requests")
@@ -4,84 +4,179 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from . import requests_bp
 from routes.auth import admin_required
 from models.db import get_db_connection
-from rules.request_rules import validate_transition
+from rules.request_rules import validate_transition, transition_sources
+from models.request_events import record_event, record_events
+from .user import request_etag, if_match_versions
 
+# Review action -> status it moves the request to
+REVIEW_ACTIONS = {
+    "approve": "in_progress",
+    "deny": "denied",
+    "complete": "completed",
+}
+
+# Most ids one bulk review may touch
+MAX_BULK_REVIEW = 1000
 
 
 @requests_bp.post("/requests/<int:request_id>/review")
 @jwt_required()
+@admin_required
 def review_request(request_id):
+    """
+    Moves one request with a single compare-and-swap UPDATE: it only
+    applies while the request is in a status the action is allowed from
+    (and, with If-Match, still at that version). A request another admin
+    moved first gets 409; a stale If-Match gets 412.
+    """
     admin_id = int(get_jwt_identity())
 
     action = request.form.get("action")
-    admin_review_notes = request.form.get("admin_review_notes")
+    admin_review_notes = request.form.get("admin_review_notes") or None
 
-    if action not in ("approve", "deny", "complete"):
+    if action not in REVIEW_ACTIONS:
         abort(400, "Invalid action")
 
-    if action == "approve":
-        new_status = "in_progress"
-    elif action == "deny":
-        new_status = "denied"
-    else:  # complete
-        new_status = "completed"
+    new_status = REVIEW_ACTIONS[action]
+    sources = transition_sources(new_status, "admin")
+    versions = if_match_versions()
 
     conn = get_db_connection()
-    cursor = conn.cursor()
 
-    # Ensure admin role
-    cursor.execute(
-        "SELECT role FROM users WHERE id = ?",
-        (admin_id,)
-    )
-    admin = cursor.fetchone()
+    row = None
+    if versions is None or versions:
+        conditions = ["id = ?", f"status IN ({', '.join('?' for _ in sources)})"]
+        params = [request_id, *sources]
+        if versions:
+            conditions.append(f"version IN ({', '.join('?' for _ in versions)})")
+            params += sorted(versions)
+
+        # Notes are preserved unless explicitly updated
+        rows = conn.execute(
+            f"""
+            UPDATE requests
+            SET status = ?,
+                reviewed_at = CURRENT_TIMESTAMP,
+                reviewed_by = ?,
+                admin_review_notes = COALESCE(?, admin_review_notes),
+                version = version + 1
+            WHERE {" AND ".join(conditions)}
+            RETURNING version
+            """,
+            (new_status, admin_id, admin_review_notes, *params)
+        ).fetchall()
+        row = rows[0] if rows else None
+
+    if row is None:
+        # Lost: find out why (this read only happens on the slow path)
+        conn.rollback()
+        current = conn.execute(
+            "SELECT status, version FROM requests WHERE id = ?",
+            (request_id,)
+        ).fetchone()
+
+        if current is None:
+            abort(404, "Request not found")
+        if versions is not None and current["version"] not in versions:
+            abort(412, "Request has changed since it was loaded")
+        abort(409, f"Request is {current['status']}; it cannot be moved to {new_status}")
+
+    # Same transaction as the status change; from_status comes from the log
+    record_event(conn, request_id, new_status, admin_id)
+
+    conn.commit()
+    conn.close()
+
+    resp = redirect(url_for("dashboard.admin_dashboard"))
+    resp.set_etag(request_etag(row["version"]))
+    return resp
 
-    if not admin or admin["role"] != "admin":
-        abort(403)
 
-    # Fetch current status
-    cursor.execute(
-        "SELECT status FROM requests WHERE id = ?",
-        (request_id,)
-    )
-    row = cursor.fetchone()
+@requests_bp.post("/requests/bulk-review")
+@jwt_required()
+@admin_required
+def bulk_review_requests():
+    """
+    Applies one review action to many requests in a single transaction.
+
+    JSON body: {"ids": [..], "action": "approve" | "deny" | "complete",
+    "admin_review_notes": optional, shared by all}. Each id is checked
+    with validate_transition; ids that fail are reported and skipped, the
+    rest are updated together. Returns {"results": [{"id", "ok", ...}],
+    "updated": n, "failed": n} in the order the ids were given.
+    """
+    admin_id = int(get_jwt_identity())
+    data = request.get_json(silent=True) or {}
 
-    if not row:
-        abort(404, "Request not found")
+    action = data.get("action")
+    if action not in REVIEW_ACTIONS:
+        return jsonify({"error": "invalid action"}), 400
+    new_status = REVIEW_ACTIONS[action]
 
-    current_status = row["status"]
+    ids = data.get("ids")
+    if not isinstance(ids, list) or not ids or not all(
+        isinstance(i, int) and not isinstance(i, bool) for i in ids
+    ):
+        return jsonify({"error": "ids must be a non-empty list of integers"}), 400
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_BULK_REVIEW:
+        return jsonify({"error": f"at most {MAX_BULK_REVIEW} ids per request"}), 400
 
-    # Enforce lifecycle
-    if not validate_transition(current_status, new_status, "admin"):
-        abort(409, "Invalid status transition")
+    notes = data.get("admin_review_notes") or None
 
-    # 🔑 IMPORTANT PART: preserve notes unless explicitly updated
-    if admin_review_notes:
-        cursor.execute(
+    conn = get_db_connection()
+
+    # Take the write lock before reading, so no status can change between
+    # the checks and the updates
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        placeholders = ", ".join("?" for _ in ids)
+        current = {
+            row["id"]: row["status"]
+            for row in conn.execute(
+                f"SELECT id, status FROM requests WHERE id IN ({placeholders})",
+                ids
+            )
+        }
+
+        results = []
+        moving = []
+        for request_id in ids:
+            status = current.get(request_id)
+            if status is None:
+                results.append({"id": request_id, "ok": False, "error": "not found"})
+            elif not validate_transition(status, new_status, "admin"):
+                results.append({"id": request_id, "ok": False, "status": status,
+                                "error": "invalid status transition"})
+            else:
+                results.append({"id": request_id, "ok": True, "status": new_status})
+                moving.append(request_id)
+
+        # Notes are kept unless new ones are given, as in review_request
+        conn.executemany(
             """
             UPDATE requests
             SET status = ?,
                 reviewed_at = CURRENT_TIMESTAMP,
                 reviewed_by = ?,
-                admin_review_notes = ?
+                admin_review_notes = COALESCE(?, admin_review_notes),
+                version = version + 1
             WHERE id = ?
             """,
-            (new_status, admin_id, admin_review_notes, request_id)
+            [(new_status, admin_id, notes, request_id) for request_id in moving]
         )
-    else:
-        cursor.execute(
-            """
-            UPDATE requests
-            SET status = ?,
-                reviewed_at = CURRENT_TIMESTAMP,
-                reviewed_by = ?
-            WHERE id = ?
-            """,
-            (new_status, admin_id, request_id)
+        record_events(
+            conn,
+            [(request_id, new_status, admin_id, current[request_id]) for request_id in moving]
         )
 
-    conn.commit()
-    conn.close()
-
-    return redirect(url_for("dashboard.admin_dashboard"))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
+    return jsonify({
+        "results": results,
+        "updated": len(moving),
+        "failed": len(results) - len(moving),
+    })
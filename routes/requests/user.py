@@ -1,9 +1,51 @@
-from flask import request, redirect, url_for, abort, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+import time
+
+from flask import request, redirect, url_for, abort, jsonify, make_response
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 
 from . import requests_bp
 from models.db import get_db_connection
 from rules.request_rules import VALID_CATEGORIES, validate_transition
+from rules.sla_rules import sla_due_ts
+from models.request_events import record_event
+from utils.ownership import enforce_owner_or_admin
+
+# Fields of a request resource (GET /requests/requests/<id>)
+REQUEST_FIELDS = (
+    "id",
+    "user_id",
+    "request_type",
+    "category",
+    "priority",
+    "department",
+    "status",
+    "created_at",
+    "reviewed_at",
+    "reviewed_by",
+    "admin_review_notes",
+    "due_ts",
+    "version",
+)
+
+
+def request_etag(version):
+    return f"v{version}"
+
+
+def if_match_versions():
+    """
+    Request versions named by the If-Match header: None when there is no
+    header (or it is *), otherwise the set of versions in it (empty if no
+    tag is one of ours, which can never match).
+    """
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+    return {
+        int(tag[1:])
+        for tag in if_match.as_set()
+        if tag.startswith("v") and tag[1:].isdigit()
+    }
 
 
 
@@ -27,16 +69,14 @@ def create_request():
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    # Ensure user is NOT admin
-    cursor.execute(
-        "SELECT role FROM users WHERE id = ?",
-        (user_id,)
-    )
-    user = cursor.fetchone()
-
-    if not user or user["role"] != "user":
+    # Ensure user is NOT admin (role claim is verified current, see utils.auth)
+    if get_jwt().get("role") != "user":
         abort(403)
 
+    # Timestamps and SLA deadline set here so no trigger has to patch the row
+    now = int(time.time())
+    created_at = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(now))
+
     cursor.execute(
         """
         INSERT INTO requests (
@@ -44,14 +84,53 @@ def create_request():
             request_type,
             category,
             priority,
-            status
+            status,
+            created_at,
+            created_ts,
+            due_ts
         )
-        VALUES (?, ?, ?, ?, 'pending')
+        VALUES (?, ?, ?, ?, 'pending', ?, ?, ?)
         """,
-        (user_id, request_type, category, priority)
+        (user_id, request_type, category, priority,
+         created_at, now, sla_due_ts(priority, now))
     )
+    record_event(conn, cursor.lastrowid, "pending", user_id, ts=now)
 
     conn.commit()
     conn.close()
 
     return redirect(url_for("dashboard.user_dashboard"))
+
+
+# Single request resource
+@requests_bp.get("/requests/<int:request_id>")
+@jwt_required()
+def get_request(request_id):
+    """
+    One request as JSON, for its owner or an admin. The ETag is the
+    request's version: send it back as If-Match when reviewing to make
+    the change conditional, or as If-None-Match to get a 304.
+    """
+    conn = get_db_connection()
+    row = conn.execute(
+        f"SELECT {', '.join(REQUEST_FIELDS)} FROM requests WHERE id = ?",
+        (request_id,)
+    ).fetchone()
+
+    if row is None:
+        return jsonify({"error": "request not found"}), 404
+
+    denied = enforce_owner_or_admin(row["user_id"])
+    if denied:
+        return denied
+
+    etag = request_etag(row["version"])
+    if request.if_none_match.contains(etag):
+        resp = make_response("", 304)
+    else:
+        resp = jsonify(dict(row))
+
+    resp.set_etag(etag)
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True
+    return resp
@@ -1,5 +1,5 @@
 from utils.auth import admin_required
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, current_app
 
 system_bp = Blueprint("system", __name__, url_prefix="/system")
 
@@ -20,5 +20,7 @@ def system_stats():
         "status": "ok",
         "service": "ops-request-platform",
         "access": "admin",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "startup_ms": current_app.config.get("STARTUP_MS"),
+        "create_app_ms": current_app.config.get("CREATE_APP_MS")
     }), 200
@@ -5,6 +5,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from models.db import get_db_connection
 from flask import request
 from utils.ownership import enforce_owner_or_admin
+from utils.auth import invalidate_auth_version
 
 
 
@@ -91,4 +92,6 @@ def delete_user(user_id):
     conn.commit()
     conn.close()
 
+    invalidate_auth_version(user_id)
+
     return jsonify({"message": "user deleted"}), 200
@@ -13,6 +13,17 @@ VALID_CATEGORIES = {
     "Security",
 }
 
+VALID_STATUSES = {
+    "pending",
+    "approved",
+    "in_progress",
+    "denied",
+    "completed",
+    "cancelled",
+}
+
+VALID_PRIORITIES = {"low", "medium", "high"}
+
 
 # Transition Validator 
 ALLOWED_TRANSITIONS = {
@@ -32,3 +43,11 @@ def validate_transition(current_status, new_status, actor_role):
     allowed = ALLOWED_TRANSITIONS.get(actor_role, {})
     return new_status in allowed.get(current_status, set())
 
+
+def transition_sources(new_status, actor_role):
+    """
+    Statuses actor_role may move a request from into new_status, sorted.
+    """
+    allowed = ALLOWED_TRANSITIONS.get(actor_role, {})
+    return sorted(s for s, targets in allowed.items() if new_status in targets)
+
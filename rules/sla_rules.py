@@ -1,8 +1,9 @@
-
-from datetime import datetime
+import time
+from datetime import datetime, timezone
 
 # SLA thresholds in HOURS by priority
 # Phase 1: Resolution SLA only (read-only, computed)
+# requests.due_ts is derived from these; changing them needs a migration.
 SLA_RULES = {
     "low": {
         "resolution_hours": 120,  # 5 days
@@ -15,46 +16,206 @@ SLA_RULES = {
     },
 }
 
+# SLA applies only while a request is open
+ACTIVE_STATUSES = ("pending", "in_progress")
+
+# 'at_risk' once less than this fraction of the target time remains
+AT_RISK_FRACTION = 0.25
+
+
+def _column(request, key):
+    """
+    request[key], or None when the row does not have that column.
+    """
+    try:
+        return request[key]
+    except (KeyError, IndexError):
+        return None
+
+
+def _epoch(request, ts_key, text_key):
+    """
+    Epoch seconds for a request timestamp.
+    Uses the integer *_ts column when the row has one (no parsing),
+    otherwise falls back to parsing the TEXT column.
+    """
+    ts = _column(request, ts_key)
+    if ts is not None:
+        return ts
+
+    value = request[text_key]
+    if not value:
+        return None
+
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
+
 
-def compute_sla_status(request):
+def compute_sla_status(request, now=None):
     """
     Compute SLA status for a request row.
     Returns string status: 'on_time', 'at_risk', or 'overdue'
+
+    Uses the row's stored due_ts when it was selected, so labels agree
+    with the SQL filters and counts below.
+
+    now: epoch seconds; pass one value when evaluating many rows.
     """
 
     status = request["status"]
     priority = request["priority"]
 
     # SLA only applies to active requests
-    if status not in ("pending", "in_progress"):
+    if status not in ACTIVE_STATUSES:
         return None
 
     rule = SLA_RULES.get(priority)
     if not rule:
         return None
 
-    created_at = datetime.fromisoformat(request["created_at"])
-    now = datetime.utcnow()
+    created = _epoch(request, "created_ts", "created_at")
+    if now is None:
+        now = time.time()
 
-    age_hours = (now - created_at).total_seconds() / 3600
-    target_hours = rule["resolution_hours"]
-    remaining_hours = target_hours - age_hours
+    due = _column(request, "due_ts")
+    if due is None:
+        due = created + rule["resolution_hours"] * 3600
+
+    remaining = due - now
 
     # Return simple string status
-    if remaining_hours < 0:
+    if remaining < 0:
         return "overdue"
-    elif remaining_hours < target_hours * 0.25:  # Less than 25% time remaining
+    elif remaining < (due - created) * AT_RISK_FRACTION:  # Less than 25% time remaining
         return "at_risk"
     else:
         return "on_time"
 
 
+def sla_due_ts(priority, created_ts):
+    """
+    SLA deadline (epoch seconds) for a request, or None if the priority
+    has no rule. Stored as requests.due_ts.
+    """
+    rule = SLA_RULES.get(priority)
+    if not rule or created_ts is None:
+        return None
+    return int(created_ts) + rule["resolution_hours"] * 3600
+
+
+def compute_sla_statuses(requests, now=None):
+    """
+    Batch form of compute_sla_status: one clock read for all rows.
+    Returns a list of statuses in row order.
+    """
+    if now is None:
+        now = time.time()
+    return [compute_sla_status(r, now) for r in requests]
+
+
+# - - - - - - - - - - - - - -
+# SQL forms of the rules above
+# - - - - - - - - - - - - - -
+# All read the stored deadline (requests.due_ts, indexed with status), so
+# each SLA status is a due_ts range per active status.
+
+# Longest at-risk window of any priority: at-risk rows are due within this
+AT_RISK_MAX_SECONDS = int(
+    max(rule["resolution_hours"] for rule in SLA_RULES.values()) * 3600 * AT_RISK_FRACTION
+)
+
+
+def _active_sql(status_col):
+    return f"{status_col} IN ({', '.join(repr(s) for s in ACTIVE_STATUSES)})"
+
+
+def _at_risk_ts_sql(prefix):
+    # The last AT_RISK_FRACTION of the span from creation to deadline
+    return f"{prefix}due_ts - ({prefix}due_ts - {prefix}created_ts) * {AT_RISK_FRACTION}"
+
+
+def sla_filter_sql(sla, now=None, alias=""):
+    """
+    WHERE fragment selecting rows whose SLA status is `sla`, written as
+    due_ts ranges so it can use idx_requests_status_due.
+    Returns (sql, params).
+    """
+    if now is None:
+        now = time.time()
+    now = int(now)
+    prefix = f"{alias}." if alias else ""
+    due = f"{prefix}due_ts"
+    at_risk_ts = _at_risk_ts_sql(prefix)
+
+    if sla == "overdue":
+        bounds, params = f"{due} < ?", [now]
+    elif sla == "at_risk":
+        bounds = f"{due} >= ? AND {due} < ? AND {at_risk_ts} < ?"
+        params = [now, now + AT_RISK_MAX_SECONDS, now]
+    elif sla == "on_time":
+        bounds, params = f"{due} >= ? AND {at_risk_ts} >= ?", [now, now]
+    else:
+        raise ValueError(f"Unknown SLA status: {sla}")
+
+    return f"{_active_sql(f'{prefix}status')} AND {bounds}", params
+
+
+def count_by_sla(conn, now=None):
+    """
+    Returns {'overdue': n, 'at_risk': n, 'on_time': n} over active requests:
+    overdue and "not yet due" are index-only due_ts ranges, at-risk reads
+    only the rows due within AT_RISK_MAX_SECONDS.
+    """
+    if now is None:
+        now = time.time()
+    now = int(now)
+    active = _active_sql("status")
+    at_risk_sql, at_risk_params = sla_filter_sql("at_risk", now)
+
+    row = conn.execute(
+        f"""
+        SELECT
+            (SELECT COUNT(*) FROM requests WHERE {active} AND due_ts < ?) AS overdue,
+            (SELECT COUNT(*) FROM requests WHERE {at_risk_sql}) AS at_risk,
+            (SELECT COUNT(*) FROM requests WHERE {active} AND due_ts >= ?) AS not_due
+        """,
+        (now, *at_risk_params, now),
+    ).fetchone()
+
+    return {
+        "overdue": row["overdue"],
+        "at_risk": row["at_risk"],
+        "on_time": row["not_due"] - row["at_risk"],
+    }
+
+
+def sla_boundaries_passed(conn, user_id, now=None):
+    """
+    Number of SLA boundaries the user's active requests have already
+    passed. Each request has two, at-risk and overdue, so while the rows
+    themselves are unchanged the count goes up exactly when some row's
+    SLA status does.
+
+    Reads only idx_requests_user_active (active rows, see
+    migrations/0018_request_watermarks.py).
+    """
+    if now is None:
+        now = time.time()
+    now = int(now)
+
+    return conn.execute(
+        f"""
+        SELECT COALESCE(SUM(({_at_risk_ts_sql("")} < ?) + (due_ts < ?)), 0)
+        FROM requests
+        WHERE user_id = ? AND {_active_sql("status")}
+        """,
+        (now, now, user_id),
+    ).fetchone()[0]
+
+
 def did_meet_sla(request):
     """
     Returns True if a completed request met SLA deadline.
     """
-    from datetime import datetime
-
     if request["status"] != "completed":
         return None
 
@@ -63,11 +224,10 @@ def did_meet_sla(request):
     if not rule:
         return None
 
-    created_at = datetime.fromisoformat(request["created_at"])
-    reviewed_at = datetime.fromisoformat(request["reviewed_at"])
+    created = _epoch(request, "created_ts", "created_at")
+    reviewed = _epoch(request, "reviewed_ts", "reviewed_at")
 
-    elapsed_hours = (reviewed_at - created_at).total_seconds() / 3600
+    elapsed_hours = (reviewed - created) / 3600
     target_hours = rule["resolution_hours"]
 
     return elapsed_hours <= target_hours
-
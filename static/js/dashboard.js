@@ -136,32 +136,30 @@ async function loadUserRequests() {
   tbody.innerHTML = `<tr><td colspan="5">Loading requests...</td></tr>`;
 
   try {
-    const res = await fetch("/dashboard/api/user/requests", {
-      credentials: "include"
-    });
-    console.log("FETCHED /dashboard/api/user/requests");
+    // Only the 5 most recent rows are shown; card stats come pre-aggregated
+    const [res, summaryRes] = await Promise.all([
+      fetch("/dashboard/api/user/requests?limit=5", { credentials: "include" }),
+      fetch("/dashboard/api/user/requests/summary", { credentials: "include" })
+    ]);
 
     if (!res.ok) {
       throw new Error(`HTTP ${res.status}`);
     }
 
     const data = await res.json();
+    const recentRequests = data.requests || [];
+
+    if (summaryRes.ok) {
+      updateDashboardStats(await summaryRes.json());
+    }
 
-    if (!Array.isArray(data) || data.length === 0) {
+    if (recentRequests.length === 0) {
       tbody.innerHTML = `<tr><td colspan="5">No requests yet</td></tr>`;
       return;
     }
 
-    // Sort by created_at (most recent first) and take only top 5
-    const recentRequests = data
-      .sort((a, b) => new Date(b.created_at) - new Date(a.created_at))
-      .slice(0, 5);
-
     tbody.innerHTML = "";
 
-    // Calculate stats from ALL requests (not just the 5 shown)
-    updateDashboardStats(data);
-
     recentRequests.forEach(req => {
       const tr = document.createElement("tr");
       tr.classList.add("request-row");
@@ -209,61 +207,31 @@ async function loadUserRequests() {
   }
 }
 
-// Update dashboard statistics
-function updateDashboardStats(requests) {
+// Update dashboard statistics (from /dashboard/api/user/requests/summary)
+function updateDashboardStats(summary) {
   // Open Items (pending status)
-  const openItems = requests.filter(r => r.status === 'pending').length;
+  const openItems = summary.open_items;
   const openItemsEl = document.getElementById('open-items');
   if (openItemsEl) {
     openItemsEl.textContent = openItems;
   }
 
   // Completed Recently (last 30 days)
-  const thirtyDaysAgo = new Date();
-  thirtyDaysAgo.setDate(thirtyDaysAgo.getDate() - 30);
-  
-  const completedRecently = requests.filter(r => {
-    const createdDate = new Date(r.created_at);
-    return (r.status === 'approved' || r.status === 'completed' || r.status === 'denied') 
-           && createdDate >= thirtyDaysAgo;
-  }).length;
-  
   const completedRecentlyEl = document.getElementById('completed-recently');
   if (completedRecentlyEl) {
-    completedRecentlyEl.textContent = completedRecently;
+    completedRecentlyEl.textContent = summary.completed_recently;
   }
 
   // This Week (last 7 days)
-  const sevenDaysAgo = new Date();
-  sevenDaysAgo.setDate(sevenDaysAgo.getDate() - 7);
-  
-  const thisWeek = requests.filter(r => {
-    const createdDate = new Date(r.created_at);
-    return createdDate >= sevenDaysAgo;
-  }).length;
-  
   const thisWeekEl = document.getElementById('this-week');
   if (thisWeekEl) {
-    thisWeekEl.textContent = thisWeek;
+    thisWeekEl.textContent = summary.this_week;
   }
 
   // Average Processing Time
-  const completed = requests.filter(r => 
-    r.status === 'approved' || r.status === 'completed' || r.status === 'denied'
-  );
-  
-  if (completed.length > 0) {
-    const avgTime = completed.reduce((sum, r) => {
-      const start = new Date(r.created_at);
-      const end = r.updated_at ? new Date(r.updated_at) : new Date();
-      const days = Math.floor((end - start) / (1000 * 60 * 60 * 24));
-      return sum + days;
-    }, 0) / completed.length;
-    
-    const avgTimeEl = document.getElementById('avg-time');
-    if (avgTimeEl) {
-      avgTimeEl.textContent = avgTime.toFixed(1);
-    }
+  const avgTimeEl = document.getElementById('avg-time');
+  if (avgTimeEl && summary.avg_processing_days !== null) {
+    avgTimeEl.textContent = summary.avg_processing_days.toFixed(1);
   }
 
   // Show/hide alert banner
@@ -7,8 +7,10 @@
 // Global State
 // ============================================
 
-let allRequests = [];
+let allRequests = [];        // every page loaded so far (current server filters)
 let filteredRequests = [];
+let nextCursor = null;
+let loadingPage = false;
 
 
 // ============================================
@@ -18,13 +20,15 @@ let filteredRequests = [];
 document.addEventListener('DOMContentLoaded', function() {
   loadRequests();
   
-  // Set up search
+  // Set up search (client-side, over the pages already loaded)
   document.getElementById('requests-search').addEventListener('input', applyFilters);
   
-  // Set up filters
-  document.getElementById('filter-status').addEventListener('change', applyFilters);
-  document.getElementById('filter-priority').addEventListener('change', applyFilters);
-  document.getElementById('filter-category').addEventListener('change', applyFilters);
+  // Set up filters (server-side: refetch from the first page)
+  document.getElementById('filter-status').addEventListener('change', () => loadRequests());
+  document.getElementById('filter-priority').addEventListener('change', () => loadRequests());
+  document.getElementById('filter-category').addEventListener('change', () => loadRequests());
+
+  document.getElementById('load-more-btn').addEventListener('click', loadMoreRequests);
   
   // Close modals on overlay click
   document.addEventListener('click', function(e) {
@@ -39,28 +43,71 @@ document.addEventListener('DOMContentLoaded', function() {
 // Data Loading
 // ============================================
 
+function buildRequestsUrl(cursor) {
+  const params = new URLSearchParams();
+
+  const filters = {
+    status: document.getElementById('filter-status').value,
+    priority: document.getElementById('filter-priority').value,
+    category: document.getElementById('filter-category').value
+  };
+
+  Object.entries(filters).forEach(([key, value]) => {
+    if (value) params.set(key, value);
+  });
+
+  if (cursor) params.set('cursor', cursor);
+
+  const query = params.toString();
+  return '/dashboard/api/user/requests' + (query ? `?${query}` : '');
+}
+
+async function fetchRequestsPage(cursor) {
+  const response = await fetch(buildRequestsUrl(cursor), {
+    credentials: 'include'
+  });
+
+  if (!response.ok) {
+    throw new Error('Failed to load requests');
+  }
+
+  return response.json();
+}
+
+// Load the first page for the current filters
 async function loadRequests() {
   try {
-    const response = await fetch('/dashboard/api/user/requests', {
-      headers: {
-        'Authorization': `Bearer ${localStorage.getItem('access_token')}`
-      }
-    });
-
-    if (!response.ok) {
-      throw new Error('Failed to load requests');
-    }
+    const page = await fetchRequestsPage(null);
+
+    allRequests = page.requests;
+    nextCursor = page.next_cursor;
 
-    allRequests = await response.json();
-    filteredRequests = [...allRequests];
-    
-    renderRequests();
+    applyFilters();
   } catch (error) {
     console.error('Error loading requests:', error);
     showError();
   }
 }
 
+// Append the next page
+async function loadMoreRequests() {
+  if (!nextCursor || loadingPage) return;
+
+  loadingPage = true;
+  try {
+    const page = await fetchRequestsPage(nextCursor);
+
+    allRequests = allRequests.concat(page.requests);
+    nextCursor = page.next_cursor;
+
+    applyFilters();
+  } catch (error) {
+    console.error('Error loading more requests:', error);
+  } finally {
+    loadingPage = false;
+  }
+}
+
 
 // ============================================
 // Filtering
@@ -68,27 +115,12 @@ async function loadRequests() {
 
 function applyFilters() {
   const searchTerm = document.getElementById('requests-search').value.toLowerCase();
-  const statusFilter = document.getElementById('filter-status').value;
-  const priorityFilter = document.getElementById('filter-priority').value;
-  const categoryFilter = document.getElementById('filter-category').value;
 
   filteredRequests = allRequests.filter(request => {
-    // Search filter
-    const matchesSearch = !searchTerm || 
+    return !searchTerm ||
       request.request_type.toLowerCase().includes(searchTerm) ||
       request.category.toLowerCase().includes(searchTerm) ||
       request.id.toString().includes(searchTerm);
-
-    // Status filter
-    const matchesStatus = !statusFilter || request.status === statusFilter;
-
-    // Priority filter
-    const matchesPriority = !priorityFilter || request.priority === priorityFilter;
-
-    // Category filter
-    const matchesCategory = !categoryFilter || request.category === categoryFilter;
-
-    return matchesSearch && matchesStatus && matchesPriority && matchesCategory;
   });
 
   renderRequests();
@@ -103,6 +135,8 @@ function renderRequests() {
   const container = document.getElementById('requests-container');
   const emptyState = document.getElementById('empty-state');
 
+  document.getElementById('load-more').style.display = nextCursor ? 'flex' : 'none';
+
   if (filteredRequests.length === 0) {
     container.style.display = 'none';
     emptyState.style.display = 'flex';
@@ -1,6 +1,92 @@
+"""
+Authorization from signed JWT claims.
+
+Access tokens carry the user's role and auth_version (see routes.auth.login).
+Route checks trust the role claim, so admin pages and actions need no role
+query. A role change bumps users.auth_version (trigger), and tokens whose
+version no longer matches are rejected by claims_are_current, which the
+JWTManager runs on every protected request. Current versions come from a
+small in-process LRU: this worker sees its own role changes at once
+(invalidate_auth_version), other workers within AUTH_VERSION_TTL seconds.
+
+Individual tokens (logout) are revoked by jti; see utils.revocation.
+"""
+import time
 from functools import wraps
-from flask import jsonify
-from flask_jwt_extended import verify_jwt_in_request, get_jwt
+
+from flask import abort, jsonify
+from flask_jwt_extended import verify_jwt_in_request, get_jwt, unset_jwt_cookies
+
+from models.db import get_db_connection
+from utils.cache import LRUCache
+from utils.revocation import token_is_revoked
+
+# Seconds a cached auth_version is trusted before it is re-read
+AUTH_VERSION_TTL = 30
+
+# Users whose versions are kept per worker; the least recently seen go first
+AUTH_VERSION_CACHE_SIZE = 10_000
+
+# user_id -> (auth_version or None if the user is gone, checked_at)
+_auth_versions = LRUCache(AUTH_VERSION_CACHE_SIZE)
+
+
+def current_auth_version(user_id):
+    """
+    The user's auth_version (None if the user no longer exists), cached
+    for AUTH_VERSION_TTL seconds.
+    """
+    now = time.monotonic()
+    cached = _auth_versions.get(user_id)
+    if cached and now - cached[1] < AUTH_VERSION_TTL:
+        return cached[0]
+
+    conn = get_db_connection()
+    row = conn.execute(
+        "SELECT auth_version FROM users WHERE id = ?",
+        (user_id,)
+    ).fetchone()
+
+    version = row["auth_version"] if row else None
+    _auth_versions.put(user_id, (version, now))
+    return version
+
+
+def invalidate_auth_version(user_id):
+    """
+    Call after changing a user's role or deleting them.
+    """
+    _auth_versions.pop(int(user_id))
+
+
+def claims_are_current(jwt_header, jwt_data):
+    """
+    JWTManager token_verification_loader: rejects tokens issued before
+    the user's last role change, or for deleted users.
+    """
+    # Tokens issued before auth_version existed count as version 0
+    return jwt_data.get("auth_version", 0) == current_auth_version(int(jwt_data["sub"]))
+
+
+def _end_session(message):
+    resp = jsonify({"error": message})
+    unset_jwt_cookies(resp)
+    return resp, 401
+
+
+def stale_token_response(jwt_header, jwt_data):
+    return _end_session("session is out of date, please log in again")
+
+
+def revoked_token_response(jwt_header, jwt_data):
+    return _end_session("session has ended, please log in again")
+
+
+def init_jwt(jwt):
+    jwt.token_verification_loader(claims_are_current)
+    jwt.token_verification_failed_loader(stale_token_response)
+    jwt.token_in_blocklist_loader(token_is_revoked)
+    jwt.revoked_token_loader(revoked_token_response)
 
 
 def admin_required(fn):
@@ -8,11 +94,8 @@ def admin_required(fn):
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()
 
-        claims = get_jwt()
-        role = claims.get("role")
-
-        if role != "admin":
-            return jsonify({"error": "admin access required"}), 403
+        if get_jwt().get("role") != "admin":
+            abort(403)
 
         return fn(*args, **kwargs)
     return wrapper
@@ -0,0 +1,80 @@
+"""
+Request-scoped identity: the signed-in user's row and preferences, loaded
+with one JOIN on first use and memoized on flask.g for the rest of the
+request. Route helpers, decorators and the template context processor all
+read from here, so a page costs one identity query however many of them
+ask.
+"""
+from flask import g
+from flask_jwt_extended import get_jwt_identity
+
+from models.db import get_db_connection
+
+USER_COLUMNS = (
+    "id",
+    "email",
+    "role",
+    "full_name",
+    "department",
+    "avatar_url",
+    "created_at",
+)
+
+_IDENTITY_SQL = f"""
+    SELECT {", ".join("u." + c for c in USER_COLUMNS)}, p.*
+    FROM users u
+    LEFT JOIN user_preferences p ON p.user_id = u.id
+    WHERE u.id = ?
+"""
+
+
+def _query_identity(user_id):
+    cur = get_db_connection().execute(_IDENTITY_SQL, (user_id,))
+    row = cur.fetchone()
+    if row is None:
+        return None
+
+    names = [d[0] for d in cur.description]
+    split = len(USER_COLUMNS)
+
+    user = dict(zip(names[:split], row[:split]))
+    # p.id is NULL when the user has no preferences row yet
+    prefs = dict(zip(names[split:], row[split:])) if row[split] is not None else None
+
+    return {"user": user, "prefs": prefs}
+
+
+def load_identity(user_id=None):
+    """
+    Returns {"user": {...}, "prefs": {...} or None} for user_id (default:
+    the JWT identity), or None if there is no such user. Memoized per
+    request.
+    """
+    if user_id is None:
+        user_id = get_jwt_identity()
+        if user_id is None:
+            return None
+    user_id = int(user_id)
+
+    cache = g.setdefault("_identities", {})
+    if user_id not in cache:
+        cache[user_id] = _query_identity(user_id)
+    return cache[user_id]
+
+
+def current_user(user_id=None):
+    identity = load_identity(user_id)
+    return identity["user"] if identity else None
+
+
+def current_prefs(user_id=None):
+    identity = load_identity(user_id)
+    return identity["prefs"] if identity else None
+
+
+def forget_identity(user_id):
+    """
+    Drops the memoized identity after this request changed the user or
+    their preferences, so the next read sees the new row.
+    """
+    g.get("_identities", {}).pop(int(user_id), None)
@@ -0,0 +1,33 @@
+import base64
+import json
+
+
+def encode_cursor(*values):
+    """
+    Opaque keyset cursor for the last row of a page, e.g. (created_at, id).
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, types):
+    """
+    Returns the cursor's values as a list, or None if the token is invalid.
+
+    `types` gives the expected type (or tuple of types) of each value, in
+    order, e.g. (str, int) for (created_at, id).
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+
+    if not isinstance(values, list) or len(values) != len(types):
+        return None
+
+    # JSON true/false would pass as int
+    for value, expected in zip(values, types):
+        if isinstance(value, bool) or not isinstance(value, expected):
+            return None
+    return values
@@ -0,0 +1,125 @@
+"""
+Access-token revocation by JWT jti.
+
+Revoked jtis live in revoked_tokens. Each worker keeps a Bloom filter of
+them in memory, so checking a token that was never revoked (almost all of
+them) costs a few hashes and no I/O; only filter hits are confirmed
+against the table.
+
+Workers stay in step incrementally: at most every SYNC_SECONDS a worker
+pulls rows with id above the last one it has seen. Every PURGE_SECONDS it
+deletes expired rows and rebuilds its filter from what is left, which also
+resets the filter's false-positive rate.
+"""
+import threading
+import time
+
+from models.db import get_db_connection
+from utils.bloom import BloomFilter
+
+SYNC_SECONDS = 1.0
+PURGE_SECONDS = 600
+
+FILTER_CAPACITY = 100_000
+FILTER_ERROR_RATE = 0.001
+
+_lock = threading.Lock()
+_state = {
+    "filter": BloomFilter(FILTER_CAPACITY, FILTER_ERROR_RATE),
+    "last_id": 0,
+    "synced_at": float("-inf"),
+    "purged_at": float("-inf"),
+}
+
+
+def _load(conn, bloom, after_id):
+    rows = conn.execute(
+        "SELECT id, jti FROM revoked_tokens WHERE id > ? ORDER BY id",
+        (after_id,)
+    ).fetchall()
+    for row in rows:
+        bloom.add(row["jti"])
+    return rows[-1]["id"] if rows else after_id
+
+
+def _rebuild(conn):
+    count = conn.execute("SELECT COUNT(*) FROM revoked_tokens").fetchone()[0]
+    capacity = FILTER_CAPACITY
+    while capacity < count * 2:
+        capacity *= 2
+
+    bloom = BloomFilter(capacity, FILTER_ERROR_RATE)
+    _state["last_id"] = _load(conn, bloom, 0)
+    _state["filter"] = bloom
+
+
+def _purge(conn):
+    # Skip if the current request already has work in flight
+    if conn.in_transaction:
+        return
+    conn.execute("DELETE FROM revoked_tokens WHERE expires_ts <= ?", (int(time.time()),))
+    conn.commit()
+
+
+def sync(force=False):
+    """
+    Brings this worker's filter up to date with revoked_tokens.
+    """
+    now = time.monotonic()
+    if not force and now - _state["synced_at"] < SYNC_SECONDS:
+        return
+
+    with _lock:
+        if not force and now - _state["synced_at"] < SYNC_SECONDS:
+            return
+
+        conn = get_db_connection()
+        if now - _state["purged_at"] >= PURGE_SECONDS:
+            _purge(conn)
+            _rebuild(conn)
+            _state["purged_at"] = now
+        else:
+            _state["last_id"] = _load(conn, _state["filter"], _state["last_id"])
+            if _state["filter"].is_full():
+                _rebuild(conn)
+
+        _state["synced_at"] = now
+
+
+def is_revoked(jti):
+    sync()
+    if jti not in _state["filter"]:
+        return False
+
+    # Possible hit: confirm against the table
+    row = get_db_connection().execute(
+        "SELECT 1 FROM revoked_tokens WHERE jti = ?",
+        (jti,)
+    ).fetchone()
+    return row is not None
+
+
+def revoke(jti, expires_ts, user_id=None):
+    """
+    Revokes one token until it would have expired. Commits.
+    """
+    conn = get_db_connection()
+    conn.execute(
+        """
+        INSERT OR IGNORE INTO revoked_tokens (jti, user_id, expires_ts)
+        VALUES (?, ?, ?)
+        """,
+        (jti, user_id, int(expires_ts))
+    )
+    conn.commit()
+
+    # Visible in this worker at once; others pick it up on their next sync
+    with _lock:
+        _state["filter"].add(jti)
+
+
+def token_is_revoked(jwt_header, jwt_data):
+    """
+    JWTManager token_in_blocklist_loader.
+    """
+    return is_revoked(jwt_data["jti"])